@@ -155,7 +155,9 @@ class CarryObject(Action):
         reg_ag = grid_world.registered_agents[agent_id]  # Registered Agent
         env_obj = grid_world.environment_objects[object_id]  # Environment object
 
-        # Updating properties
+        # Updating properties, in place so we tell both that their properties change
+        env_obj._properties_changed()
+        reg_ag._properties_changed()
         env_obj.carried_by.append(agent_id)
         reg_ag.is_carrying.append(env_obj)  # we add the entire object!
 
@@ -294,7 +296,9 @@ class CarryObjectTogether(Action):
         reg_ag = grid_world.registered_agents[agent_id]  # Registered Agent
         env_obj = grid_world.environment_objects[object_id]  # Environment object
 
-        # Updating properties
+        # Updating properties, in place so we tell both that their properties change
+        env_obj._properties_changed()
+        reg_ag._properties_changed()
         env_obj.carried_by.append(agent_id)
         reg_ag.is_carrying.append(env_obj)  # we add the entire object!
 
@@ -605,7 +609,9 @@ class GrabObjectResult(ActionResult):
 def _act_drop(grid_world, agent, env_obj, drop_loc):
     """ Private MATRX method."""
 
-    # Updating properties
+    # Updating properties, in place so we tell both that their properties change
+    agent._properties_changed()
+    env_obj._properties_changed()
     agent.is_carrying.remove(env_obj)
     env_obj.carried_by.remove(agent.obj_id)
 
@@ -0,0 +1,85 @@
+import sys
+import time
+import random
+from worlds1.WorldBuilder import create_builder
+from matrx.agents.agent_utils.navigator import AStarPlanner, WeightedAStarPlanner, FastAStarPlanner, \
+    FastWeightedAStarPlanner, DStarLitePlanner
+from matrx.agents.agent_utils.state_tracker import get_traversability_map, get_weighted_traversability_map
+
+# Compares the A* planners of the Navigator with their fast counterparts on the maps of the tutorial and official task:
+# both have to find identical paths, and the fast ones should do so in less time. Run with the number of start and goal
+# pairs to plan for (default 200) as argument.
+#
+# It also compares replanning after every move, as the Navigator does, while walking to a distant goal on a map on which
+# now and then a location gets blocked: from scratch with the weighted A* planners or by repairing the previous search
+# with D* Lite. All have to find equally long paths.
+if __name__ == "__main__":
+    nr_plans = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    action_set = ['MoveNorth', 'MoveEast', 'MoveSouth', 'MoveWest']
+    planners = [(AStarPlanner, FastAStarPlanner, get_traversability_map),
+                (WeightedAStarPlanner, FastWeightedAStarPlanner, get_weighted_traversability_map)]
+
+    for task_type in ['tutorial', 'official']:
+        builder = create_builder(task_type=task_type, condition='tutorial' if task_type == 'tutorial' else 'baseline',
+                                 headless=True)
+        world = builder.get_world()
+        world.initialize({'run_matrx_api': False})
+
+        # The map as an agent perceiving the entire world would see it
+        state = {obj_id: obj.properties for obj_id, obj in world.environment_objects.items()}
+        state['World'] = {'grid_shape': world.shape}
+        rng = random.Random(0)
+
+        for planner_class, fast_planner_class, traversability_map_func in planners:
+            occupation_map, _ = traversability_map_func(state=state)
+            free_locs = [(x, y) for x in range(world.shape[0]) for y in range(world.shape[1])
+                         if occupation_map[x, y] < 1]
+            pairs = [(rng.choice(free_locs), rng.choice(free_locs)) for _ in range(nr_plans)]
+
+            durations = []
+            paths = []
+            for planner in [planner_class(action_set, {"metric": "euclidean"}),
+                            fast_planner_class(action_set, {"metric": "euclidean"})]:
+                start_time = time.perf_counter()
+                paths.append([planner.plan(start, goal, occupation_map) for start, goal in pairs])
+                durations.append(time.perf_counter() - start_time)
+
+            assert paths[0] == paths[1], f"{fast_planner_class.__name__} found different paths"
+            print(f"{task_type} map, {nr_plans} plans: {planner_class.__name__} {durations[0]:.3f}s, "
+                  f"{fast_planner_class.__name__} {durations[1]:.3f}s ({durations[0] / durations[1]:.1f}x faster)")
+
+        # The walks, as the starts and maps of each plan along the way
+        occupation_map, _ = get_weighted_traversability_map(state=state)
+        free_locs = [(x, y) for x in range(world.shape[0]) for y in range(world.shape[1]) if occupation_map[x, y] < 1]
+        walks = []
+        while len(walks) < nr_plans // 10:
+            start, goal = rng.choice(free_locs), rng.choice(free_locs)
+            walk_map = occupation_map
+            walk = []
+            path = FastWeightedAStarPlanner(action_set, {}).plan(start, goal, walk_map)
+            if len(path) < 20:
+                continue
+            while path and path != [start]:
+                walk.append((start, walk_map))
+                if len(walk) % 15 == 0:
+                    walk_map = walk_map.copy()
+                    walk_map[rng.choice(free_locs)] = 1
+                start = path[0]
+                path = FastWeightedAStarPlanner(action_set, {}).plan(start, goal, walk_map)
+            walks.append((goal, walk))
+
+        durations = {}
+        path_lengths = {}
+        for planner_class in [WeightedAStarPlanner, FastWeightedAStarPlanner, DStarLitePlanner]:
+            start_time = time.perf_counter()
+            path_lengths[planner_class] = []
+            for goal, walk in walks:
+                planner = planner_class(action_set, {"metric": "euclidean"})
+                path_lengths[planner_class].extend(len(planner.plan(start, goal, walk_map)) for start, walk_map in walk)
+            durations[planner_class] = time.perf_counter() - start_time
+
+        assert path_lengths[DStarLitePlanner] == path_lengths[WeightedAStarPlanner], "D* Lite found longer paths"
+        print(f"{task_type} map, {len(walks)} walks of {sum(len(walk) for _, walk in walks)} plans: " +
+              ", ".join(f"{planner_class.__name__} {duration:.3f}s" for planner_class, duration in durations.items()))
+
+        builder.stop()
@@ -10,27 +10,31 @@ from loggers.OutputLogger import output_logger
 
 if __name__ == "__main__":
     fld = os.getcwd()
+    # Run with '--headless' to run the world without the api and visualizer, as fast as possible
+    headless = '--headless' in sys.argv
     print("\nEnter one of the task types 'tutorial' or 'official':")
     choice1=input()
     if choice1=='tutorial':
-        builder = create_builder(task_type='tutorial', condition='tutorial')
+        builder = create_builder(task_type='tutorial', condition='tutorial', headless=headless)
     else:
         # ADD QUESTION ON CONDITION HERE
-        builder = create_builder(task_type='official', condition='baseline')
+        builder = create_builder(task_type='official', condition='baseline', headless=headless)
 
     # Start overarching MATRX scripts and threads, such as the api and/or visualizer if requested. Here we also link our own media resource folder with MATRX.
     media_folder = pathlib.Path().resolve()
-    builder.startup(media_folder=media_folder)
-    print("Starting custom visualizer")
-    vis_thread = visualization_server.run_matrx_visualizer(verbose=False, media_folder=media_folder)
+    if not headless:
+        builder.startup(media_folder=media_folder)
+        print("Starting custom visualizer")
+        vis_thread = visualization_server.run_matrx_visualizer(verbose=False, media_folder=media_folder)
     world = builder.get_world()
     print("Started world...")
     #builder.api_info['matrx_paused'] = False
     world.run(builder.api_info)
     print("DONE!")
-    print("Shutting down custom visualizer")
-    r = requests.get("http://localhost:" + str(visualization_server.port) + "/shutdown_visualizer")
-    vis_thread.join()
+    if not headless:
+        print("Shutting down custom visualizer")
+        r = requests.get("http://localhost:" + str(visualization_server.port) + "/shutdown_visualizer")
+        vis_thread.join()
     if choice1=="official":
         # Generate one final output log file for the official task type
         output_logger(fld)
@@ -110,6 +110,18 @@ def _possible_movement(grid_world, agent_id, dx, dy):
     loc = agent_avatar.location
     new_loc = [loc[0] + dx, loc[1] + dy]
     if 0 <= new_loc[0] < grid_world.shape[0] and 0 <= new_loc[1] < grid_world.shape[1]:
+        # The entity table counts the intraversable agents and objects at each location. Only when there are both, the
+        # first one at that location determines the result, so then we go through them as below.
+        entity_table = grid_world.entity_table
+        if entity_table is not None and (dx, dy) != (0, 0):
+            nr_agents, nr_objects = entity_table.intraversable_at(new_loc)
+            if nr_agents == 0 and nr_objects == 0:
+                return MoveActionResult(MoveActionResult.RESULT_SUCCESS, succeeded=True)
+            elif nr_objects == 0:
+                return MoveActionResult(MoveActionResult.RESULT_OCCUPIED, succeeded=False)
+            elif nr_agents == 0:
+                return MoveActionResult(MoveActionResult.RESULT_NOT_PASSABLE_OBJECT, succeeded=False)
+
         loc_obj_ids = grid_world.grid[new_loc[1], new_loc[0]]
         if loc_obj_ids is None:
             # there is nothing at that location
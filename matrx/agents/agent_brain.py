@@ -12,6 +12,10 @@ class AgentBrain:
     """ An artificial agent whose behaviour can be programmed to be, for example, (semi-)autonomous.
     """
 
+    # Whether this brain keeps no state over the ticks in which its agent is busy, such that observing the world in
+    # those ticks has no lasting effect. A headless GridWorld can then skip those ticks for this agent.
+    stateless = False
+
     def __init__(self, memorize_for_ticks=None):
         """ Defines the behavior of an agent.
 
@@ -72,6 +76,12 @@ class AgentBrain:
             The random seed with which this agent's `rnd_gen` was initialized. This
             seed is based on the master random seed given of the
             :class:`matrx.grid_world.GridWorld`.
+        stateless: bool
+            Whether this brain keeps no state over the ticks in which its agent
+            is busy with an action, other than what it needs to decide on its
+            next action. Override this class attribute with True when that is
+            the case, so a headless :class:`matrx.grid_world.GridWorld` can warp
+            through the ticks in which all agents are busy. Defaults to False.
         """
         # Class variables for tracking the past action and its result
         self.previous_action = None
@@ -6,9 +6,54 @@
                     of view algorithm for use in tile-based games.
                     Based on the algorithm presented at
                     http://roguebasin.roguelikedevelopment.org/index.php?title=Precise_Permissive_Field_of_View.
+
+    Adapted for MATRX to work on a NumPy opacity grid and return a boolean visibility mask, without creating objects for
+    each line and view.
 """
 
-import copy
+import numpy as np
+
+
+def _visibility_mask(opacity, start_x, start_y, radius):
+    """
+    Determines which coordinates on a 2D grid are visible from a
+    particular coordinate.
+
+    opacity:                A boolean array of the grid's (width,
+                            height), True where a coordinate blocks
+                            sight to coordinates "behind" it.
+
+    start_x, start_y:       The (x, y) coordinate on the grid that
+                            is the centre of view.
+
+    radius:                 How far the field of view may extend
+                            in either direction along the x and y
+                            axis.
+
+    Returns a boolean array of the grid's (width, height) that is True
+    for each visible coordinate.
+    """
+    map_width, map_height = opacity.shape
+    radius = int(radius)
+    visible = np.zeros(opacity.shape, dtype=bool)
+
+    # Will always see the centre.
+    visible[start_x, start_y] = True
+
+    # Get the dimensions of the actual field of view, making
+    # sure not to go off the map or beyond the radius.
+    min_extent_x = min(start_x, radius)
+    max_extent_x = min(map_width - start_x - 1, radius)
+    min_extent_y = min(start_y, radius)
+    max_extent_y = min(map_height - start_y - 1, radius)
+
+    # Northeast, southeast, southwest and northwest quadrant
+    _check_quadrant(visible, opacity, start_x, start_y, 1, 1, max_extent_x, max_extent_y)
+    _check_quadrant(visible, opacity, start_x, start_y, 1, -1, max_extent_x, min_extent_y)
+    _check_quadrant(visible, opacity, start_x, start_y, -1, -1, min_extent_x, min_extent_y)
+    _check_quadrant(visible, opacity, start_x, start_y, -1, 1, min_extent_x, max_extent_y)
+
+    return visible
 
 
 def _field_of_view(start_x, start_y, map_width, map_height, radius, func_visit_tile, func_tile_blocked):
@@ -18,7 +63,7 @@ def _field_of_view(start_x, start_y, map_width, map_height, radius, func_visit_t
     This code is released without warranty.
 
     Determines which coordinates on a 2D grid are visible from a
-    particular coordinate.
+    particular coordinate, see _visibility_mask.
 
     startX, startY:         The (x, y) coordinate on the grid that
                             is the centre of view.
@@ -40,117 +85,26 @@ def _field_of_view(start_x, start_y, map_width, map_height, radius, func_visit_t
                             Returns True if the coordinate blocks
                             sight to coordinates "behind" it.
     """
+    radius = int(radius)
+    opacity = np.zeros((map_width, map_height), dtype=bool)
+    for x in range(max(start_x - radius, 0), min(start_x + radius + 1, map_width)):
+        for y in range(max(start_y - radius, 0), min(start_y + radius + 1, map_height)):
+            opacity[x, y] = func_tile_blocked(x, y)
 
-    visited = set()  # Keep track of what tiles have been visited so
-    # that no tile will be visited twice.
-
-    # Will always see the centre.
-    func_visit_tile(start_x, start_y)
-    visited.add((start_x, start_y))
-
-    # Ge the dimensions of the actual field of view, making
-    # sure not to go off the map or beyond the radius.
-
-    if start_x < radius:
-        min_extent_x = start_x
-    else:
-        min_extent_x = radius
-
-    if map_width - start_x - 1 < radius:
-        max_extent_x = map_width - start_x - 1
-    else:
-        max_extent_x = radius
-
-    if start_y < radius:
-        min_extent_y = start_y
-    else:
-        min_extent_y = radius
-
-    if map_height - start_y - 1 < radius:
-        max_extent_y = map_height - start_y - 1
-    else:
-        max_extent_y = radius
-
-    # Northeast quadrant
-    __check_quadrant(visited, start_x, start_y, 1, 1, max_extent_x, max_extent_y, func_visit_tile, func_tile_blocked)
-
-    # Southeast quadrant
-    __check_quadrant(visited, start_x, start_y, 1, -1,
-                     max_extent_x, min_extent_y,
-                     func_visit_tile, func_tile_blocked)
-
-    # Southwest quadrant
-    __check_quadrant(visited, start_x, start_y, -1, -1,
-                     min_extent_x, min_extent_y,
-                     func_visit_tile, func_tile_blocked)
-
-    # Northwest quadrant
-    __check_quadrant(visited, start_x, start_y, -1, 1,
-                     min_extent_x, max_extent_y,
-                     func_visit_tile, func_tile_blocked)
+    for x, y in zip(*np.nonzero(_visibility_mask(opacity, start_x, start_y, radius))):
+        func_visit_tile(int(x), int(y))
 
 
 # -------------------------------------------------------------
+# A line is a list [xi, yi, xf, yf] and a view a list [shallow line, steep line, shallow bump, steep bump], where a bump
+# is a tuple (x, y, parent bump) or None. Bumps are never changed, so views that are split can share them.
 
-class __Line(object):
-    def __init__(self, xi, yi, xf, yf):
-        self.xi = xi
-        self.yi = yi
-        self.xf = xf
-        self.yf = yf
-
-    dx = property(fget=lambda self: self.xf - self.xi)
-    dy = property(fget=lambda self: self.yf - self.yi)
+def _relative_slope(line, x, y):
+    return (line[3] - line[1]) * (line[2] - x) - (line[2] - line[0]) * (line[3] - y)
 
-    def p_below(self, x, y):
-        return self.relative_slope(x, y) > 0
 
-    def p_below_or_collinear(self, x, y):
-        return self.relative_slope(x, y) >= 0
-
-    def p_above(self, x, y):
-        return self.relative_slope(x, y) < 0
-
-    def p_above_or_collinear(self, x, y):
-        return self.relative_slope(x, y) <= 0
-
-    def p_collinear(self, x, y):
-        return self.relative_slope(x, y) == 0
-
-    def line_collinear(self, line):
-        return self.p_collinear(line.xi, line.yi) \
-               and self.p_collinear(line.xf, line.yf)
-
-    def relative_slope(self, x, y):
-        return (self.dy * (self.xf - x)) \
-               - (self.dx * (self.yf - y))
-
-
-class __ViewBump:
-    def __init__(self, x, y, parent):
-        self.x = x
-        self.y = y
-        self.parent = parent
-
-
-class __View:
-    def __init__(self, shallow_line, steep_line):
-        self.shallow_line = shallow_line
-        self.steep_line = steep_line
-
-        self.shallow_bump = None
-        self.steep_bump = None
-
-
-def __check_quadrant(visited, start_x, start_y, dx, dy,
-                     extent_x, extent_y, func_visit_tile, func_tile_blocked):
-    active_views = []
-
-    shallow_line = __Line(0, 1, extent_x, 0)
-    steep_line = __Line(1, 0, 0, extent_y)
-
-    active_views.append(__View(shallow_line, steep_line))
-    view_index = 0
+def _check_quadrant(visible, opacity, start_x, start_y, dx, dy, extent_x, extent_y):
+    active_views = [[[0, 1, extent_x, 0], [1, 0, 0, extent_y], None, None]]
 
     # Visit the tiles diagonally and going outwards
     #
@@ -161,156 +115,110 @@ def __check_quadrant(visited, start_x, start_y, dx, dy,
     # 5  8  .
     # 2  4  7
     # @  1  3  6  .  .  .
-    max_i = extent_x + extent_y
-    i = 1
-    while i != max_i + 1 and len(active_views) > 0:
-        if 0 > i - extent_x:
-            start_j = 0
-        else:
-            start_j = i - extent_x
-
-        if i < extent_y:
-            max_j = i
-        else:
-            max_j = extent_y
-
-        j = start_j
-        while j != max_j + 1 and view_index < len(active_views):
-            x = i - j
-            y = j
-            __visit_coord(visited, start_x, start_y, x, y, dx, dy,
-                          view_index, active_views,
-                          func_visit_tile, func_tile_blocked)
-
-            j += 1
+    for i in range(1, extent_x + extent_y + 1):
+        for j in range(max(i - extent_x, 0), min(i, extent_y) + 1):
+            if not active_views:
+                return
+            _visit_coord(visible, opacity, start_x, start_y, i - j, j, dx, dy, active_views)
 
-        i += 1
 
-
-def __visit_coord(visited, start_x, start_y, x, y, dx, dy, view_index,
-                  active_views, func_visit_tile, func_tile_blocked):
-    # The top left and bottom right corners of the current coordinate.
-    top_left = (x, y + 1)
-    bottom_right = (x + 1, y)
-
-    while view_index < len(active_views) \
-            and active_views[view_index].steep_line.p_below_or_collinear(bottom_right[0], bottom_right[1]):
+def _visit_coord(visible, opacity, start_x, start_y, x, y, dx, dy, active_views):
+    # The top left (x, y + 1) and bottom right (x + 1, y) corners of the current coordinate.
+    nr_views = len(active_views)
+    view_index = 0
+    while view_index < nr_views and _relative_slope(active_views[view_index][1], x + 1, y) >= 0:
         # The current coordinate is above the current view and is
         # ignored.  The steeper fields may need it though.
         view_index += 1
 
-    if view_index == len(active_views) \
-            or active_views[view_index].shallow_line.p_above_or_collinear(top_left[0], top_left[1]):
+    if view_index == nr_views or _relative_slope(active_views[view_index][0], x, y + 1) <= 0:
         # Either the current coordinate is above all of the fields
         # or it is below all of the fields.
         return
 
     # It is now known that the current coordinate is between the steep
     # and shallow lines of the current view.
+    real_x = start_x + x * dx
+    real_y = start_y + y * dy
+    visible[real_x, real_y] = True
 
-    is_blocked = False
-
-    # The real quadrant coordinates
-    real_x = x * dx
-    real_y = y * dy
-
-    if (start_x + real_x, start_y + real_y) not in visited:
-        visited.add((start_x + real_x, start_y + real_y))
-        func_visit_tile(start_x + real_x, start_y + real_y)
-    """else:
-        # Debugging
-        print (start_x + real_x, start_y + real_y)"""
-
-    is_blocked = func_tile_blocked(start_x + real_x, start_y + real_y)
-
-    if not is_blocked:
+    if not opacity[real_x, real_y]:
         # The current coordinate does not block sight and therefore
         # has no effect on the view.
         return
 
-    if active_views[view_index].shallow_line.p_above(bottom_right[0], bottom_right[1]) \
-            and active_views[view_index].steep_line.p_below(top_left[0], top_left[1]):
+    view = active_views[view_index]
+    above_shallow = _relative_slope(view[0], x + 1, y) < 0
+    below_steep = _relative_slope(view[1], x, y + 1) > 0
+    if above_shallow and below_steep:
         # The current coordinate is intersected by both lines in the
         # current view.  The view is completely blocked.
         del active_views[view_index]
-    elif active_views[view_index].shallow_line.p_above(
-            bottom_right[0], bottom_right[1]):
+    elif above_shallow:
         # The current coordinate is intersected by the shallow line of
         # the current view.  The shallow line needs to be raised.
-        __add_shallow_bump(top_left[0], top_left[1],
-                           active_views, view_index)
-        __check_view(active_views, view_index)
-    elif active_views[view_index].steep_line.p_below(
-            top_left[0], top_left[1]):
+        _add_shallow_bump(x, y + 1, view)
+        if not _check_view(view):
+            del active_views[view_index]
+    elif below_steep:
         # The current coordinate is intersected by the steep line of
         # the current view.  The steep line needs to be lowered.
-        __add_steep_bump(bottom_right[0], bottom_right[1], active_views,
-                         view_index)
-        __check_view(active_views, view_index)
+        _add_steep_bump(x + 1, y, view)
+        if not _check_view(view):
+            del active_views[view_index]
     else:
         # The current coordinate is completely between the two lines
         # of the current view.  Split the current view into two views
         # above and below the current coordinate.
+        shallow_view = [view[0][:], view[1][:], view[2], view[3]]
+        active_views.insert(view_index, shallow_view)
 
-        shallow_view_index = view_index
-        view_index += 1
-        steep_view_index = view_index
-
-        active_views.insert(shallow_view_index, copy.deepcopy(active_views[shallow_view_index]))
-
-        __add_steep_bump(bottom_right[0], bottom_right[1],
-                         active_views, shallow_view_index)
-        if not __check_view(active_views, shallow_view_index):
-            view_index -= 1
-            steep_view_index -= 1
-
-        __add_shallow_bump(top_left[0], top_left[1], active_views,
-                           steep_view_index)
-        __check_view(active_views, steep_view_index)
+        _add_steep_bump(x + 1, y, shallow_view)
+        if _check_view(shallow_view):
+            view_index += 1
+        else:
+            del active_views[view_index]
 
+        _add_shallow_bump(x, y + 1, view)
+        if not _check_view(view):
+            del active_views[view_index]
 
-def __add_shallow_bump(x, y, active_views, view_index):
-    active_views[view_index].shallow_line.xf = x
-    active_views[view_index].shallow_line.yf = y
 
-    active_views[view_index].shallow_bump = __ViewBump(x, y, active_views[view_index].shallow_bump)
+def _add_shallow_bump(x, y, view):
+    shallow_line = view[0]
+    shallow_line[2] = x
+    shallow_line[3] = y
+    view[2] = (x, y, view[2])
 
-    cur_bump = active_views[view_index].steep_bump
+    cur_bump = view[3]
     while cur_bump is not None:
-        if active_views[view_index].shallow_line.p_above(cur_bump.x, cur_bump.y):
-            active_views[view_index].shallow_line.xi = cur_bump.x
-            active_views[view_index].shallow_line.yi = cur_bump.y
-
-        cur_bump = cur_bump.parent
+        if _relative_slope(shallow_line, cur_bump[0], cur_bump[1]) < 0:
+            shallow_line[0] = cur_bump[0]
+            shallow_line[1] = cur_bump[1]
+        cur_bump = cur_bump[2]
 
 
-def __add_steep_bump(x, y, active_views, view_index):
-    active_views[view_index].steep_line.xf = x
-    active_views[view_index].steep_line.yf = y
+def _add_steep_bump(x, y, view):
+    steep_line = view[1]
+    steep_line[2] = x
+    steep_line[3] = y
+    view[3] = (x, y, view[3])
 
-    active_views[view_index].steep_bump = __ViewBump(x, y, active_views[view_index].steep_bump)
-
-    cur_bump = active_views[view_index].shallow_bump
+    cur_bump = view[2]
     while cur_bump is not None:
-        if active_views[view_index].steep_line.p_below(cur_bump.x, cur_bump.y):
-            active_views[view_index].steep_line.xi = cur_bump.x
-            active_views[view_index].steep_line.yi = cur_bump.y
-
-        cur_bump = cur_bump.parent
+        if _relative_slope(steep_line, cur_bump[0], cur_bump[1]) > 0:
+            steep_line[0] = cur_bump[0]
+            steep_line[1] = cur_bump[1]
+        cur_bump = cur_bump[2]
 
 
-def __check_view(active_views, view_index):
+def _check_view(view):
     """
-        Removes the view in active_views at index view_index if
-            - The two lines are coolinear
+        Whether a view is still open, which it is not when
+            - The two lines are collinear
             - The lines pass through either extremity
     """
-
-    shallow_line = active_views[view_index].shallow_line
-    steep_line = active_views[view_index].steep_line
-
-    if shallow_line.line_collinear(steep_line) and (shallow_line.p_collinear(0, 1) or shallow_line.p_collinear(1, 0)):
-        del active_views[view_index]
-        return False
-    else:
-        return True
+    shallow_line, steep_line = view[0], view[1]
+    return not (_relative_slope(shallow_line, steep_line[0], steep_line[1]) == 0
+                and _relative_slope(shallow_line, steep_line[2], steep_line[3]) == 0
+                and (_relative_slope(shallow_line, 0, 1) == 0 or _relative_slope(shallow_line, 1, 0) == 0))
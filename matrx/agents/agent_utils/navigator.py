@@ -1,4 +1,5 @@
 import heapq
+import math
 import warnings
 from collections import OrderedDict
 
@@ -17,9 +18,15 @@ class Navigator:
     action_set: list
         List of actions the agent can perform.
     algorithm: string. Optional, default "a_star"
-        The path planning algorithm to use. As of now only A* is supported.
+        The path planning algorithm to use: "a_star", "weighted_a_star", "fast_a_star" and "fast_weighted_a_star"
+        which find the same paths as the former two but faster, or "d_star_lite" which repairs its previous search
+        when the agent moves or the map changes. Any other name requires a custom_algorithm_class.
     is_circular: bool (Default: False)
         When True, it will continuously navigate given waypoints, until infinity.
+    cache_route: bool (Default: False)
+        When True, the path to the current waypoint is kept and only planned again when the agent deviates from it,
+        the waypoint changes or an intraversable object is perceived on the remainder of the path. Note that a path
+        that opens up in the meantime is then not taken. See `get_route_stats`.
 
     Warnings
     --------
@@ -35,9 +42,12 @@ class Navigator:
     """The A* algorithm parameter for path planning."""
     A_STAR_ALGORITHM = "a_star"
     WEIGHTED_A_STAR_ALGORITHM = "weighted_a_star"
+    FAST_A_STAR_ALGORITHM = "fast_a_star"
+    FAST_WEIGHTED_A_STAR_ALGORITHM = "fast_weighted_a_star"
+    D_STAR_LITE_ALGORITHM = "d_star_lite"
 
     def __init__(self, agent_id, action_set, algorithm=A_STAR_ALGORITHM, custom_algorithm_class=None, traversability_map_func=get_traversability_map, 
-                algorithm_settings={"metric": "euclidean"}, is_circular=False):
+                algorithm_settings={"metric": "euclidean"}, is_circular=False, cache_route=False):
         # Set action set
         self.__action_set = action_set
 
@@ -77,6 +87,12 @@ class Navigator:
         # Current traversability map
         self.__occupation_map = None
 
+        # The path to the current waypoint, if we keep it (see cache_route), as (key, path, route, traversabilities)
+        self.__cache_route = cache_route
+        self.__cached_route = None
+        self.__route_hits = 0  # how often the cached route was still valid
+        self.__route_misses = 0  # how often we planned a new route while caching them
+
 
     def add_waypoint(self, waypoint):
         """ Adds a waypoint to the path.
@@ -226,6 +242,17 @@ class Navigator:
 
         return move_action
 
+    def get_route_stats(self):
+        """ Returns how often the route to the current waypoint was reused, when routes are cached.
+
+        Returns
+        -------
+        dict
+            The number of "hits" (times the cached route was used) and "misses" (times a new route was planned).
+
+        """
+        return {"hits": self.__route_hits, "misses": self.__route_misses}
+
     def reset(self):
         """ Resets all waypoints to not being visited.
         """
@@ -284,6 +311,15 @@ class Navigator:
         elif algorithm == self.WEIGHTED_A_STAR_ALGORITHM:
             self.__traversability_map_func = get_weighted_traversability_map
             return WeightedAStarPlanner(action_set=action_set, settings=algorithm_settings)
+        elif algorithm == self.FAST_A_STAR_ALGORITHM:
+            self.__traversability_map_func = get_traversability_map
+            return FastAStarPlanner(action_set=action_set, settings=algorithm_settings)
+        elif algorithm == self.FAST_WEIGHTED_A_STAR_ALGORITHM:
+            self.__traversability_map_func = get_weighted_traversability_map
+            return FastWeightedAStarPlanner(action_set=action_set, settings=algorithm_settings)
+        elif algorithm == self.D_STAR_LITE_ALGORITHM:
+            self.__traversability_map_func = get_weighted_traversability_map
+            return DStarLitePlanner(action_set=action_set, settings=algorithm_settings)
         elif algorithm != "" and custom_algorithm_class is not None:
             return custom_algorithm_class(action_set=action_set, settings=algorithm_settings)
         elif algorithm is None:
@@ -349,12 +385,20 @@ class Navigator:
             else:
                 return []
 
-        # Get our occupation map
-        self.__occupation_map, obj_grid = self.__traversability_map_func(state=state_tracker.get_memorized_state())
-
         # Get our current waypoint
         current_wp = self.__get_current_waypoint()
 
+        # Reuse the route we planned before, if still valid
+        if self.__cache_route:
+            route = self.__get_cached_route(agent_loc, current_wp, state_tracker)
+            if route is not None:
+                self.__route_hits += 1
+                return route
+            self.__route_misses += 1
+
+        # Get our occupation map
+        self.__occupation_map, obj_grid = self.__traversability_map_func(state=state_tracker.get_memorized_state())
+
         # Plan a path using the chosen path planning algorithm
         path = self.__path_planning_algo.plan(start=agent_loc, goal=current_wp.location,
                                               occupation_map=self.__occupation_map)
@@ -363,6 +407,63 @@ class Navigator:
         # one location to the other
         route = self.__get_route_from_path(agent_loc, path)
 
+        # Only a path that reaches the waypoint is kept, any other is planned again
+        if self.__cache_route:
+            reaches_waypoint = len(path) > 0 and tuple(path[-1]) == tuple(current_wp.location)
+            path = [tuple(loc) for loc in path]
+            traversabilities = [float(self.__occupation_map[loc]) for loc in path]
+            self.__cached_route = (self.__get_route_key(current_wp), path, route, traversabilities) \
+                if reaches_waypoint else None
+
+        return route
+
+    def __get_route_key(self, current_wp):
+        """ A private MATRX method.
+
+        Returns what a route planned now depends on besides the state: the current waypoint (compared by identity),
+        its location and the traversability penalty of the path planner (if any).
+
+        """
+        penalty_multiplier = getattr(self.__path_planning_algo, "traversability_penalty_multiplier", None)
+        return current_wp, tuple(current_wp.location), penalty_multiplier
+
+    def __get_cached_route(self, agent_loc, current_wp, state_tracker):
+        """ A private MATRX method.
+
+        Returns the cached route if it is still valid: it was planned with the same waypoint and penalty, the agent is
+        on it and the traversability of the remainder of the path did not change. Returns None otherwise.
+
+        Only the locations on the remainder of the path are checked, through the location index of the state tracker.
+
+        """
+        if self.__cached_route is None:
+            return None
+        key, path, route, traversabilities = self.__cached_route
+        if key != self.__get_route_key(current_wp) or agent_loc not in route:
+            return None
+
+        # The remainder of the path follows the agent's location, which is either the start or on the path
+        agent_loc = tuple(agent_loc)
+        start = path.index(agent_loc) + 1 if agent_loc in path else 0
+        if start == len(path):
+            return route
+
+        # A custom traversability map can depend on anything in the state, so then we can only compute it entirely
+        if self.__traversability_map_func is get_traversability_map:
+            weighted = False
+        elif self.__traversability_map_func is get_weighted_traversability_map:
+            weighted = True
+        else:
+            occupation_map, _ = self.__traversability_map_func(state=state_tracker.get_memorized_state())
+            if any(occupation_map[loc] != traversability
+                   for loc, traversability in zip(path[start:], traversabilities[start:])):
+                return None
+            return route
+
+        for loc, traversability in zip(path[start:], traversabilities[start:]):
+            if _get_traversability(state_tracker.get_objects_at(loc), weighted) != traversability:
+                return None
+
         return route
 
     def __get_route_from_path(self, agent_loc, path):
@@ -465,9 +566,9 @@ class AStarPlanner(PathPlanner):
             metric = settings['metric']
         
         if metric == self.EUCLIDEAN_METRIC:
-            self.heuristic = lambda p1, p2: np.sqrt(np.sum((np.array(p1) - np.array(p2)) ** 2, axis=0))
+            self.heuristic = _euclidean_distance
         elif metric == self.MANHATTAN_METRIC:
-            self.heuristic = lambda p1, p2: np.abs(p1[0] - p2[0]) + np.abs(p1[1] - p2[1])
+            self.heuristic = _manhattan_distance
         else:
             raise Exception(f"The distance metric {metric} for A* heuristic not known.")
 
@@ -558,9 +659,9 @@ class WeightedAStarPlanner(PathPlanner):
         self.traversability_penalty_multiplier = 10 if "traversability_penalty_multiplier" not in settings else settings['traversability_penalty_multiplier']
 
         if metric == self.EUCLIDEAN_METRIC:
-            self.heuristic = lambda p1, p2: np.sqrt(np.sum((np.array(p1) - np.array(p2)) ** 2, axis=0))
+            self.heuristic = _euclidean_distance
         elif metric == self.MANHATTAN_METRIC:
-            self.heuristic = lambda p1, p2: np.abs(p1[0] - p2[0]) + np.abs(p1[1] - p2[1])
+            self.heuristic = _manhattan_distance
         else:
             raise Exception(f"The distance metric {metric} for A* heuristic not known.")
 
@@ -643,6 +744,369 @@ class WeightedAStarPlanner(PathPlanner):
         return [start]
 
 
+class FastAStarPlanner(PathPlanner):
+    """ A* algorithm for path planning, that finds exactly the same paths as the AStarPlanner but faster.
+
+    Instead of dictionaries and coordinate tuples it uses flat lists indexed by location (x * height + y), it counts
+    the entries of each location in its heap instead of searching the heap, and it computes distances with scalar math
+    instead of NumPy arrays. Locations in the heap with the same f-score are still ordered by their (x, y) coordinate.
+    Besides the euclidean and manhattan metric it supports the octile metric (the distance when moving diagonally
+    costs the square root of two).
+    """
+
+    EUCLIDEAN_METRIC = "euclidean"
+    MANHATTAN_METRIC = "manhattan"
+    OCTILE_METRIC = "octile"
+
+    # Whether the occupation map holds traversability penalties (see WeightedAStarPlanner)
+    weighted = False
+
+    def __init__(self, action_set, settings):
+        super().__init__(action_set, settings)
+
+        metric = settings.get('metric', self.EUCLIDEAN_METRIC)
+        self.traversability_penalty_multiplier = settings.get('traversability_penalty_multiplier', 10)
+
+        if metric == self.EUCLIDEAN_METRIC:
+            self.heuristic = _euclidean_length
+        elif metric == self.MANHATTAN_METRIC:
+            self.heuristic = _manhattan_length
+        elif metric == self.OCTILE_METRIC:
+            self.heuristic = _octile_length
+        else:
+            raise Exception(f"The distance metric {metric} for A* heuristic not known.")
+
+    def plan(self, start, goal, occupation_map):
+        """ Plan a route from the start to the goal.
+
+        A* algorithm, returns the shortest path to get from goal to start.
+        Uses an 2D numpy array, with 0 being traversable, anything else (e.g. 1) not traversable. When weighted, 1 is
+        not traversable and anything between 0 and 1 is a penalty for moving there.
+
+        Parameters
+        ----------
+        start : tuple
+            The starting (x,y) coordinate.
+        goal : tuple
+            The goal (x,y) coordinate.
+        occupation_map : nparray
+            The array representing which grid coordinates are blocked and which are not.
+
+        Returns
+        -------
+        The list of coordinates to move to from start to finish.
+        """
+        width, height = occupation_map.shape
+        occupation = occupation_map.ravel().tolist()
+        heuristic = self.heuristic
+        penalty_multiplier = self.traversability_penalty_multiplier
+        weighted = self.weighted
+        goal_x, goal_y = goal[0], goal[1]
+        # As with the AStarPlanner, only a goal tuple is ever equal to a location on the path
+        goal_idx = goal_x * height + goal_y if isinstance(goal, tuple) and 0 <= goal_x < width and 0 <= goal_y < height \
+            else -1
+
+        # possible movements, with their offset in the flat lists and their cost
+        moves = [(dx, dy, dx * height + dy, heuristic(dx, dy)) for dx, dy in self.move_actions.values()]
+
+        nr_locs = width * height
+        gscore = [0] * nr_locs
+        came_from = [-1] * nr_locs
+        closed = [False] * nr_locs
+        nr_in_heap = [0] * nr_locs  # the number of entries of each location in the heap, some of them outdated
+
+        start_idx = start[0] * height + start[1]
+        oheap = [(heuristic(start[0] - goal_x, start[1] - goal_y), start_idx)]
+        nr_in_heap[start_idx] = 1
+
+        while oheap:
+            current = heapq.heappop(oheap)[1]
+            nr_in_heap[current] -= 1
+
+            if current == goal_idx:
+                path = []
+                while came_from[current] != -1:
+                    path.append(divmod(current, height))
+                    current = came_from[current]
+                return path[::-1]
+
+            closed[current] = True
+            current_x, current_y = divmod(current, height)
+            current_g = gscore[current]
+            for dx, dy, offset, cost in moves:
+                x, y = current_x + dx, current_y + dy
+                if not (0 <= x < width and 0 <= y < height):
+                    # array bound walls
+                    continue
+                neighbor = current + offset
+
+                traversability = occupation[neighbor]
+                if weighted:
+                    if traversability == 1:
+                        continue
+                    # if the traversability is between 1 and 0, it indicates a preference
+                    if 0 < traversability < 1:
+                        cost = cost * (penalty_multiplier * traversability)
+                elif traversability != 0:
+                    continue
+                tentative_g_score = current_g + cost
+
+                if closed[neighbor] and tentative_g_score >= gscore[neighbor]:
+                    continue
+
+                if tentative_g_score < gscore[neighbor] or nr_in_heap[neighbor] == 0:
+                    came_from[neighbor] = current
+                    gscore[neighbor] = tentative_g_score
+                    heapq.heappush(oheap, (tentative_g_score + heuristic(x - goal_x, y - goal_y), neighbor))
+                    nr_in_heap[neighbor] += 1
+
+        # If no path is available we stay put
+        return [start]
+
+
+class FastWeightedAStarPlanner(FastAStarPlanner):
+    """ Weighted A* algorithm for path planning, that finds exactly the same paths as the WeightedAStarPlanner but
+    faster (see FastAStarPlanner).
+    """
+
+    weighted = True
+
+
+class DStarLitePlanner(PathPlanner):
+    """ D* Lite algorithm for path planning (Koenig and Likhachev, 2002).
+
+    Searches backwards from the goal and keeps that search between plans to the same goal. When the agent moved or
+    the occupation map changed since the last plan, the search is only repaired where needed instead of starting over.
+    The search starts over when the goal or the size of the map changes.
+
+    Plans on a weighted occupation map (see get_weighted_traversability_map) like the WeightedAStarPlanner: 1 is not
+    traversable, and moving to a location with a value between 0 and 1 costs that value times the
+    traversability_penalty_multiplier setting (default 10) times the distance moved. Objects such as water can thus be
+    costly to cross instead of blocking, by giving them a `traversability_penalty` property.
+    """
+
+    EUCLIDEAN_METRIC = "euclidean"
+    MANHATTAN_METRIC = "manhattan"
+    OCTILE_METRIC = "octile"
+
+    def __init__(self, action_set, settings):
+        super().__init__(action_set, settings)
+
+        metric = settings.get('metric', self.EUCLIDEAN_METRIC)
+        self.traversability_penalty_multiplier = settings.get('traversability_penalty_multiplier', 10)
+
+        if metric == self.EUCLIDEAN_METRIC:
+            self.heuristic = _euclidean_length
+        elif metric == self.MANHATTAN_METRIC:
+            self.heuristic = _manhattan_length
+        elif metric == self.OCTILE_METRIC:
+            self.heuristic = _octile_length
+        else:
+            raise Exception(f"The distance metric {metric} for D* Lite heuristic not known.")
+
+        # The search, kept between plans to the same goal. Locations are indexed by x * height + y.
+        self.__goal = None  # the (x, y) goal of the search, None if there is no search yet
+        self.__occupation_map = None  # the occupation map of the search
+        self.__occupation = None  # the same, as a flat list
+        self.__moves = None  # the possible (dx, dy) moves, with their offset in the flat lists and their length
+        self.__g = None  # the cost to the goal from each location
+        self.__rhs = None  # the one step lookahead of the cost to the goal from each location
+        self.__queue = []  # heap of (key, location) of inconsistent locations, some of them outdated
+        self.__queue_keys = {}  # the current key of each location in the queue
+        self.__km = 0  # the key modifier; the heuristic distances summed over all moves of the start so far
+        self.__start = None  # the location from which we last planned
+
+    def plan(self, start, goal, occupation_map):
+        """ Plan a route from the start to the goal.
+
+        Parameters
+        ----------
+        start : tuple
+            The starting (x,y) coordinate.
+        goal : tuple
+            The goal (x,y) coordinate.
+        occupation_map : nparray
+            The array with the (weighted) traversability of each grid coordinate.
+
+        Returns
+        -------
+        The list of coordinates to move to from start to finish.
+        """
+        width, height = occupation_map.shape
+        goal = tuple(goal)
+        if not (0 <= goal[0] < width and 0 <= goal[1] < height):
+            self.__goal = None
+            return [start]
+        start_idx = start[0] * height + start[1]
+
+        if goal != self.__goal or self.__occupation_map.shape != occupation_map.shape:
+            self.__initialize(start_idx, goal, occupation_map)
+        else:
+            self.__km += self.__distance(self.__start, start_idx)
+            self.__start = start_idx
+            self.__update_occupation(occupation_map)
+
+        self.__compute_shortest_path()
+        return self.__extract_path(start)
+
+    def __initialize(self, start_idx, goal, occupation_map):
+        """ Starts a new search to the goal. """
+        width, height = occupation_map.shape
+        self.__goal = goal
+        self.__occupation_map = occupation_map.copy()
+        self.__occupation = occupation_map.ravel().tolist()
+        self.__moves = [(dx, dy, dx * height + dy, self.heuristic(dx, dy))
+                        for dx, dy in self.move_actions.values() if (dx, dy) != (0, 0)]
+        self.__g = [math.inf] * (width * height)
+        self.__rhs = [math.inf] * (width * height)
+        self.__km = 0
+        self.__start = start_idx
+
+        goal_idx = goal[0] * height + goal[1]
+        self.__rhs[goal_idx] = 0
+        self.__queue = []
+        self.__queue_keys = {}
+        self.__update_vertex(goal_idx)
+
+    def __update_occupation(self, occupation_map):
+        """ Repairs the search for all locations whose occupation changed, as that changed the cost to move there. """
+        changed = np.flatnonzero(occupation_map.ravel() != self.__occupation_map.ravel())
+        if len(changed) == 0:
+            return
+
+        width, height = occupation_map.shape
+        goal_idx = self.__goal[0] * height + self.__goal[1]
+        old_occupation = self.__occupation
+        self.__occupation_map = occupation_map.copy()
+        self.__occupation = occupation_map.ravel().tolist()
+        g, rhs = self.__g, self.__rhs
+        for loc in changed.tolist():
+            x, y = divmod(loc, height)
+            for dx, dy, offset, length in self.__moves:
+                # The location from which this move leads to the changed location
+                if not (0 <= x - dx < width and 0 <= y - dy < height):
+                    continue
+                pred = loc - offset
+                old_cost = self.__cost(old_occupation, loc, length)
+                new_cost = self.__cost(self.__occupation, loc, length)
+                if pred != goal_idx:
+                    if old_cost > new_cost:
+                        rhs[pred] = min(rhs[pred], new_cost + g[loc])
+                    elif rhs[pred] == old_cost + g[loc]:
+                        rhs[pred] = self.__lookahead(pred)
+                self.__update_vertex(pred)
+
+    def __compute_shortest_path(self):
+        """ Expands inconsistent locations until the cost from the start to the goal is known. """
+        width, height = self.__occupation_map.shape
+        goal_idx = self.__goal[0] * height + self.__goal[1]
+        start = self.__start
+        g, rhs = self.__g, self.__rhs
+        queue, queue_keys = self.__queue, self.__queue_keys
+
+        while queue:
+            old_key, loc = queue[0]
+            if queue_keys.get(loc) != old_key:
+                heapq.heappop(queue)  # outdated
+                continue
+            if not (old_key < self.__key(start) or rhs[start] > g[start]):
+                break
+            heapq.heappop(queue)
+
+            new_key = self.__key(loc)
+            if old_key < new_key:
+                queue_keys[loc] = new_key
+                heapq.heappush(queue, (new_key, loc))
+                continue
+
+            x, y = divmod(loc, height)
+            preds = [(loc - offset, length) for dx, dy, offset, length in self.__moves
+                     if 0 <= x - dx < width and 0 <= y - dy < height]
+            cost = self.__cost(self.__occupation, loc, 1)
+            if g[loc] > rhs[loc]:
+                g[loc] = rhs[loc]
+                del queue_keys[loc]
+                for pred, length in preds:
+                    if pred != goal_idx:
+                        rhs[pred] = min(rhs[pred], length * cost + g[loc])
+                    self.__update_vertex(pred)
+            else:
+                old_g = g[loc]
+                g[loc] = math.inf
+                for pred, length in preds:
+                    if pred != goal_idx and rhs[pred] == length * cost + old_g:
+                        rhs[pred] = self.__lookahead(pred)
+                    self.__update_vertex(pred)
+                if loc != goal_idx:
+                    rhs[loc] = self.__lookahead(loc)
+                self.__update_vertex(loc)
+
+    def __extract_path(self, start):
+        """ Returns the path from the start to the goal, by moving to the location with the lowest cost to the goal
+        (including the cost of moving there) each step. """
+        width, height = self.__occupation_map.shape
+        goal_idx = self.__goal[0] * height + self.__goal[1]
+        g = self.__g
+
+        path = []
+        loc = self.__start
+        for _ in range(width * height):
+            if loc == goal_idx:
+                return path
+            x, y = divmod(loc, height)
+            best_loc, best_cost = None, math.inf
+            for dx, dy, offset, length in self.__moves:
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    cost = self.__cost(self.__occupation, loc + offset, length) + g[loc + offset]
+                    if cost < best_cost:
+                        best_loc, best_cost = loc + offset, cost
+            if best_loc is None:
+                break
+            path.append(divmod(best_loc, height))
+            loc = best_loc
+
+        # If no path is available we stay put
+        return [start]
+
+    def __update_vertex(self, loc):
+        """ Puts an inconsistent location in the queue (again) with its current key, or takes it out if consistent. """
+        if self.__g[loc] != self.__rhs[loc]:
+            key = self.__key(loc)
+            self.__queue_keys[loc] = key
+            heapq.heappush(self.__queue, (key, loc))
+        else:
+            self.__queue_keys.pop(loc, None)
+
+    def __lookahead(self, loc):
+        """ Returns the lowest cost to the goal via any of the locations we can move to from the given one. """
+        width, height = self.__occupation_map.shape
+        x, y = divmod(loc, height)
+        return min((self.__cost(self.__occupation, loc + offset, length) + self.__g[loc + offset]
+                    for dx, dy, offset, length in self.__moves if 0 <= x + dx < width and 0 <= y + dy < height),
+                   default=math.inf)
+
+    def __key(self, loc):
+        min_g = min(self.__g[loc], self.__rhs[loc])
+        return min_g + self.__distance(self.__start, loc) + self.__km, min_g
+
+    def __distance(self, loc, other_loc):
+        """ The heuristic distance between two locations. """
+        height = self.__occupation_map.shape[1]
+        x, y = divmod(loc, height)
+        other_x, other_y = divmod(other_loc, height)
+        return self.heuristic(x - other_x, y - other_y)
+
+    def __cost(self, occupation, loc, length):
+        """ The cost of a move of the given length to a location, given the occupation. """
+        traversability = occupation[loc]
+        if traversability == 1:
+            return math.inf
+        # if the traversability is between 1 and 0, it indicates a preference. Higher scores should be avoided
+        if 0 < traversability < 1:
+            return length * (self.traversability_penalty_multiplier * traversability)
+        return length
+
+
 class Waypoint:
     """ A private MATRX class.
 
@@ -731,3 +1195,44 @@ def get_move_actions(action_set):
     move_actions[None] = (0, 0)
 
     return move_actions
+
+
+
+def _get_traversability(objects, weighted):
+    """ Returns the traversability of a location with the given objects, as it is in the map of
+    get_weighted_traversability_map if weighted and get_traversability_map (inverted) otherwise. """
+    traversability = 0.0
+    for properties in objects:
+        if not properties['is_traversable']:
+            traversability = max(traversability, 1.0)
+        elif weighted and 'traversability_penalty' in properties:
+            traversability = max(traversability, properties['traversability_penalty'])
+    return traversability
+
+
+def _euclidean_distance(p1, p2):
+    """ The euclidean distance between two (x, y) coordinates, used as the A* heuristic. Defined here (and not as a
+    lambda) so planners can be pickled, e.g. to send an agent to a worker process. """
+    return np.sqrt(np.sum((np.array(p1) - np.array(p2)) ** 2, axis=0))
+
+
+def _manhattan_distance(p1, p2):
+    """ The manhattan distance between two (x, y) coordinates, used as the A* heuristic. """
+    return np.abs(p1[0] - p2[0]) + np.abs(p1[1] - p2[1])
+
+
+def _euclidean_length(dx, dy):
+    """ The euclidean length of a (dx, dy) move, used as the FastAStarPlanner heuristic. """
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def _manhattan_length(dx, dy):
+    """ The manhattan length of a (dx, dy) move, used as the FastAStarPlanner heuristic. """
+    return abs(dx) + abs(dy)
+
+
+def _octile_length(dx, dy):
+    """ The octile length of a (dx, dy) move, with diagonal steps of length sqrt(2), used as the FastAStarPlanner
+    heuristic. """
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
@@ -1,11 +1,15 @@
 import copy
-from collections import Iterable, MutableMapping
+import heapq
+from collections import Counter, Iterable, MutableMapping
 
-from matrx import utils
 from matrx.objects import Door, AreaTile, Wall
 import numpy as np
 
 
+# The number of distance maps a State keeps, for the most recent agent locations (see State.get_distance_map)
+_NR_DISTANCE_MAPS = 16
+
+
 class State(MutableMapping):
 
     def __init__(self, own_id, memorize_for_ticks=None):
@@ -14,11 +18,38 @@ class State(MutableMapping):
         else:
             self.__decay_val = 1.0 / memorize_for_ticks
 
+        # An object that is no longer perceived is remembered, while its decay drops by the decay value with each state
+        # update, until it reaches zero. As every decay starts at one when the object was last perceived, we compute
+        # once after how many state updates that is, and remember each object until then.
+        self.__memory_updates = 0  # after how many updates without perceiving an object it is forgotten
+        if self.__decay_val > 0:
+            decay = 1.0
+            while decay > 0:
+                decay = max(decay - self.__decay_val, 0)
+                self.__memory_updates += 1
+
         self.__me = None
         self.__own_id = own_id
         self.__state_dict = {}
         self.__prev_state_dict = {}
-        self.__decays = {}
+        self.__nr_updates = 0  # the number of state updates so far
+        self.__perceived_ids = set()  # IDs of the objects in the most recent state update (and the world info)
+        self.__remembered = {}  # the objects no longer perceived but still remembered, as they were last perceived
+        self.__expiries = {}  # the state update at which each remembered object is forgotten
+        self.__expiry_heap = []  # (expiry, object ID) of remembered objects, some outdated as they were perceived again
+        self.__id_order = {}  # the IDs of all objects known since they were last forgotten, in the order they became so
+        self.__shared = False  # whether the above are shared with a copy of this state (see State.copy)
+        self.__indexes = {}  # the _PropertyIndex of each property searched for since the state last changed
+        self.__positions = None  # the position of each object ID in the state dict, to order found objects by
+        self.__query_results = {}  # the objects found for each query since the state last changed
+        self.__locations = None  # the row of each object ID with a location, and an array with those locations
+        self.__traversable = None  # a boolean array of which (x, y) locations are traversable
+        self.__intraversable_counts = None  # the state of which the number of intraversable objects per location was
+                                            # last counted, and those counts
+        self.__distance_maps = {}  # the distance maps of the most recent agent locations, by grid shape and location
+        self.__path_distances = None  # the location from which path distances were computed last, and those distances
+        self.__query_hits = Counter()  # how often each query was answered from self.__query_results
+        self.__query_misses = 0  # how often a query was not (and had to be searched for)
 
     def state_update(self, state_dict):
 
@@ -35,6 +66,7 @@ class State(MutableMapping):
             # Set the previous and new state
             self.__prev_state_dict = self.__state_dict.copy()
             self.__state_dict = state_dict.copy()
+            self.__state_changed()
 
             # Set the "me"
             self.__me = self.get_self()
@@ -42,65 +74,60 @@ class State(MutableMapping):
             # Return self
             return self
 
-        # Else: decay does matter so we need to handle knowledge decay
-        prev_state = self.__state_dict.copy()
-        state = state_dict.copy()
-
-        # Get the ids of all newly perceived objects
-        new_ids = set(state.keys()) - set(prev_state.keys())
-
-        # Get the ids of all objects that were perceived before as well
-        persistent_ids = set(state.keys()) - new_ids
-
-        # Get the ids of all objects that are not perceived any more
-        gone_ids = set(prev_state.keys()) - set(state.keys())
-
-        # Decay the decays of all objects that are not perceived any longer
-        for obj_id in gone_ids:
-            self.__decays[obj_id] = max((self.__decays[obj_id] - self.__decay_val), 0)
-
-        # Reset the decays of all objects that are still perceived
-        for obj_id in persistent_ids:
-            self.__decays[obj_id] = 1.0
-
-        # Add all new decays of the newly perceived objects
+        # Else: decay does matter so we need to handle knowledge decay. We only go through the objects that are perceived
+        # now or were perceived in the previous update, and those that are forgotten now. The others are remembered
+        # as they are.
+        self.__unshare()
+        self.__nr_updates += 1
+
+        # Remember the objects that are no longer perceived, as they were perceived in the previous update
+        for obj_id in self.__perceived_ids.difference(state_dict.keys()):
+            if obj_id in self.__state_dict:
+                expiry = self.__nr_updates - 1 + self.__memory_updates
+                self.__remembered[obj_id] = self.__state_dict[obj_id]
+                self.__expiries[obj_id] = expiry
+                heapq.heappush(self.__expiry_heap, (expiry, obj_id))
+
+        # Objects that are perceived again no longer have to be remembered
+        for obj_id in self.__remembered.keys() & state_dict.keys():
+            self.__remembered.pop(obj_id)
+            self.__expiries.pop(obj_id)
+
+        # Perceived objects that are not known yet become known: those added to the state otherwise (see
+        # _add_world_info) go first, then the objects that are new to the state
+        perceived_ids = set(state_dict.keys())
+        new_ids = perceived_ids - set(self.__state_dict.keys())
+        persistent_ids = perceived_ids - new_ids
+        if not persistent_ids <= self.__id_order.keys():
+            for obj_id in persistent_ids:
+                self.__id_order.setdefault(obj_id, None)
         for obj_id in new_ids:
-            self.__decays[obj_id] = 1.0
-
-        # Check for non-zero decays and flag them for keeping (this now also
-        # includes all new_ids as we just added them).
-        to_keep_ids = []
-        to_remove_ids = []
-        for obj_id, decay in self.__decays.items():
-            if decay > 0:
-                to_keep_ids.append(obj_id)
-            # tag all zero decay objects, this reduces
-            # the self.__decays of growing with zero decays
-            else:
-                to_remove_ids.append(obj_id)
-        to_keep_ids = set(to_keep_ids)
-        
-        # Remove zero decay items
-        for obj_id in to_remove_ids:
-            self.__decays.pop(obj_id, None)
-
-        # Create new state
-        new_state = {}
-        for obj_id in to_keep_ids:
-            # If the object id is in the received state, pick that one. This
-            # makes sure that any objects that were also in the previous state
-            # get updated with newly perceived properties
-            if obj_id in state.keys():
-                new_state[obj_id] = state[obj_id]
-            # If the object id is not in the received state, it may still be
-            # in the previous state (e.g. because its decay was non-zero).
-            # Though this only happens when decay is set.
-            elif obj_id in prev_state.keys():
-                new_state[obj_id] = prev_state[obj_id]
+            self.__id_order.setdefault(obj_id, None)
+
+        # Forget the objects whose decay reached zero, skipping those that were perceived again in the meantime
+        while self.__expiry_heap and self.__expiry_heap[0][0] <= self.__nr_updates:
+            expiry, obj_id = heapq.heappop(self.__expiry_heap)
+            if self.__expiries.get(obj_id) == expiry:
+                self.__remembered.pop(obj_id)
+                self.__expiries.pop(obj_id)
+                self.__id_order.pop(obj_id)
+
+        # Create new state, with all perceived and all remembered objects. They are in the order of a set of the IDs of
+        # all known objects, made from a list in the order they became known (a set made from a dictionary can have
+        # another order). Objects found in the state, and so those at the same distance in e.g. get_closest_objects,
+        # are returned in this order.
+        objects = self.__remembered.copy()
+        objects.update(state_dict)
+        obj_ids = set(list(self.__id_order))
+        if len(obj_ids) != len(objects):  # some known objects were removed from the state
+            obj_ids = [obj_id for obj_id in obj_ids if obj_id in objects]
+        new_state = dict(zip(obj_ids, map(objects.__getitem__, obj_ids)))
+        self.__perceived_ids = perceived_ids
 
         # Set the new state
         self.__prev_state_dict = self.__state_dict
         self.__state_dict = new_state
+        self.__state_changed()
 
         # Set the "me"
         self.__me = self.get_self()
@@ -219,7 +246,9 @@ class State(MutableMapping):
         raise ValueError("You cannot set items to the state, use state.state_update(...) instead.")
 
     def __delitem__(self, key):
+        self.__unshare()
         del self.__state_dict[key]
+        self.__state_changed(removed_id=key)
 
     def __iter__(self):
         return iter(self.__state_dict)
@@ -234,23 +263,67 @@ class State(MutableMapping):
         raise ValueError("You cannot update the state, use state.state_update(...) instead.")
 
     def copy(self):
-        return copy.deepcopy(self)
+        """ Returns a copy of this state in constant time. The copy shares its objects (the dictionaries of their
+        properties) with this state, so these should not be changed. Updating either state, or removing objects from
+        it, does not affect the other.
+        """
+        clone = copy.copy(self)
+        clone.__query_hits = Counter(self.__query_hits)
+
+        # Both states share their dictionaries until either one changes, which then first copies them
+        self.__shared = True
+        clone.__shared = True
+        return clone
 
     def pop(self, obj_id):
-        return self.__state_dict.pop(obj_id)
+        self.__unshare()
+        obj = self.__state_dict.pop(obj_id)
+        self.__state_changed(removed_id=obj_id)
+        return obj
 
     def remove(self, obj_id):
+        self.__unshare()
         self.__state_dict.pop(obj_id)
+        self.__state_changed(removed_id=obj_id)
 
     def as_dict(self):
         return self.__state_dict
 
     def _add_world_info(self, world_info_dict):
+        self.__unshare()
         self.__state_dict["World"] = world_info_dict
+        self.__perceived_ids.add("World")
+        self.__state_changed()
 
     ###############################################
     #     Some helpful getters for the state      #
     ###############################################
+    @staticmethod
+    def compile_query(props, combined=True):
+        """ Parses a query once, such that it can be executed on every new state without parsing it again.
+
+        Parameters
+        ----------
+        props : dict, str or list
+            The query, as given to `state[...]` or State.get_with_property.
+        combined : bool (optional, default True)
+            Whether objects should have all given properties (True), or any of them (False).
+
+        Returns
+        -------
+        StateQuery
+            The query, which is executed by calling it with the state, or by passing it to `state[...]` or
+            State.get_with_property (in which case the combined given here is used).
+
+        Examples
+        --------
+        Compile a query once in an agent's initialize method, and execute it on each new state:
+        >>> self.victims_query = State.compile_query({"is_collectable": True})
+        >>> victims = self.victims_query(state)
+
+        """
+        return StateQuery(props, combined)
+
     def get_with_property(self, props, combined=True):
         found = self.__find_object(props, combined)
         return found
@@ -258,6 +331,19 @@ class State(MutableMapping):
     def get_world_info(self):
         return self.__state_dict['World']
 
+    def get_query_stats(self):
+        """ Returns how often queries (e.g. `state[{'name': 'water'}]`) were answered from the results of the same
+        query earlier on the same state, and how often they had to be searched for. Collected over the entire lifetime
+        of this State.
+
+        Returns
+        -------
+        dict
+            The number of "hits" and "misses", and under "repeated_queries" the number of hits of each query.
+        """
+        return {"hits": sum(self.__query_hits.values()), "misses": self.__query_misses,
+                "repeated_queries": dict(self.__query_hits)}
+
     def remove_with_property(self, props, combined=True):
         found = self.__find_object(props, combined)
         if found is None:
@@ -378,9 +464,8 @@ class State(MutableMapping):
         if objs is None:
             return None
 
-        objs = np.array(objs)
         # Remove itself, since the agent self is always closest...
-        other_objects = np.array([o for o in objs if o['obj_id'] != self.__own_id])
+        other_objects = [o for o in objs if o['obj_id'] != self.__own_id]
         closest_objects = self.__get_closest(other_objects)
         return closest_objects
 
@@ -389,9 +474,8 @@ class State(MutableMapping):
         if objs is None:
             return None
 
-        objs = np.array(objs)
         # Remove itself, since the agent self is always closest...
-        other_objects = np.array([o for o in objs if o['obj_id'] != self.__own_id])
+        other_objects = [o for o in objs if o['obj_id'] != self.__own_id]
         closest_objects = self.__get_closest(other_objects)
         return closest_objects
 
@@ -404,7 +488,6 @@ class State(MutableMapping):
         if objs is None:
             return None
 
-        objs = np.array(objs)
         closest_objects = self.__get_closest(objs)
         return closest_objects
 
@@ -414,10 +497,52 @@ class State(MutableMapping):
             return None
 
         # Remove itself, since the agent self is always closest...
-        other_agents = np.array([a for a in agents if a['obj_id'] != self.__own_id])
+        other_agents = [a for a in agents if a['obj_id'] != self.__own_id]
         closest_agents = self.__get_closest(other_agents)
         return closest_agents
 
+    def get_k_closest(self, k, props=None, combined=True, metric="euclidean"):
+        """ Returns the k objects closest to this agent, sorted from closest to furthest.
+
+        Parameters
+        ----------
+        k : int
+            The (maximum) number of objects to return.
+        props : dict, str or list (optional, default None)
+            The properties of the objects to consider, as in State.get_with_property. When None, all objects with a
+            location are considered.
+        combined : bool (optional, default True)
+            Whether objects should have all given properties (True), or any of them (False).
+        metric : str (optional, default "euclidean")
+            How to measure the distance to an object; "euclidean" for the straight line distance, or "path" for the
+            number of horizontal and vertical steps needed to get to the object over traversable locations. Objects
+            that can not be reached are then left out.
+
+        Returns
+        -------
+        list
+            The closest objects other than the agent itself (objects at the same distance are in the order they are in
+            the state), or None if there are none.
+
+        Examples
+        --------
+        Get the three victims the agent can walk to the fastest:
+        >>> state.get_k_closest(3, props={"is_collectable": True}, metric="path")
+
+        """
+        if props is None:
+            objs = [self.__state_dict[obj_id] for obj_id in self.__get_location_table()[0]]
+        else:
+            objs = self.__find_object(props=props, combined=combined)
+            if objs is None:
+                return None
+
+        # Remove itself, since the agent self is always closest...
+        objs = [o for o in objs if o['obj_id'] != self.__own_id]
+        dists = self.__get_distances(objs, metric)
+        closest = [objs[idx] for idx in np.argsort(dists, kind="stable")[:k] if np.isfinite(dists[idx])]
+        return closest if closest else None
+
     def get_self(self):
         me = self.__find_object(props={'obj_id': self.__own_id}, combined=True)[0]
         return me
@@ -426,27 +551,41 @@ class State(MutableMapping):
     # Some higher level abstractions of the state #
     ###############################################
     def get_traverse_map(self):
-        width, length = self.get_world_info()['grid_shape']
-        coords = [(x, y) for x in range(width) for y in range(length)]
-        traverse_map = {c: True for c in coords}
-        intrav_objs = self.get_with_property(props={'is_traversable': False, 'location': (None, )}, combined=False)
-        for o in intrav_objs:
-            traverse_map[(o['location'][0], o['location'][1])] = False
+        """ Returns which locations are traversable, which they are when there is no intraversable object at them.
 
-        return traverse_map
+        Returns
+        -------
+        np.ndarray
+            A read-only boolean array of the grid's (width, height), True at each traversable location. Index it with
+            `traverse_map[x, y]` or `traverse_map[(x, y)]`.
+        """
+        return self.__get_traversable()
 
     def get_distance_map(self):
-        width, length = self.get_world_info()['grid_shape']
-        coords = [(x, y) for x in range(width) for y in range(length)]
+        """ Returns the (euclidean) distance from this agent to every location.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only array of the grid's (width, height), with the distance to each location. Index it with
+            `distance_map[x, y]` or `distance_map[(x, y)]`.
+        """
         if self.__me is not None:
             loc = self.__me['location']
         else:
             loc = self.get_self()['location']
 
-        def distance(coord):
-            return utils.get_distance(loc, coord)
-
-        dist_map = {c: distance(c) for c in coords}
+        # The distance map only depends on the agent's location, so we keep those of the most recent locations
+        key = (tuple(self.get_world_info()['grid_shape']), tuple(loc))
+        dist_map = self.__distance_maps.get(key)
+        if dist_map is None:
+            xs, ys = np.indices(key[0])
+            dx, dy = xs - loc[0], ys - loc[1]
+            dist_map = np.sqrt(dx * dx + dy * dy)
+            dist_map.flags.writeable = False
+            if len(self.__distance_maps) >= _NR_DISTANCE_MAPS:
+                self.__distance_maps.pop(next(iter(self.__distance_maps)))
+            self.__distance_maps[key] = dist_map
 
         return dist_map
 
@@ -460,46 +599,111 @@ class State(MutableMapping):
         if len(objs) == 0:
             return None
 
+        dists = self.__get_distances(objs)
+        closest_objects = [objs[idx] for idx in np.flatnonzero(dists == dists.min())]
+
+        return closest_objects
+
+    def __get_distances(self, objs, metric="euclidean"):
+        # The distance from this agent to each of the given objects, as an array
         if self.__me is not None:
             my_loc = self.__me['location']
         else:
             my_loc = self.get_self()['location']
 
-        def distance(x):
-            loc = x['location']
-            return utils.get_distance(my_loc, loc)
-
-        dists = np.array(list(map(distance, objs)))
-        closest_idx = np.where(dists == dists.min())[0]
-        closest_objects = objs[closest_idx]
-        closest_objects = list(closest_objects)
-
-        return closest_objects
+        # Take the locations of the objects from the array with the locations of all objects in this state
+        rows, locations = self.__get_location_table()
+        locations = locations[[rows[obj['obj_id']] for obj in objs]]
+
+        if metric == "euclidean":
+            deltas = locations - my_loc
+            return np.sqrt((deltas * deltas).sum(axis=1))
+        elif metric == "path":
+            path_distances = self.__get_path_distances(tuple(my_loc))
+            return path_distances[locations[:, 0].astype(int), locations[:, 1].astype(int)]
+        raise ValueError(f"Unknown distance metric '{metric}', should be 'euclidean' or 'path'.")
+
+    def __get_location_table(self):
+        # The row of each object ID with a location, and an array with those locations
+        if self.__locations is None:
+            obj_ids = [obj_id for obj_id, obj in self.__state_dict.items() if 'location' in obj]
+            locations = np.array([self.__state_dict[obj_id]['location'] for obj_id in obj_ids], dtype=float)
+            self.__locations = ({obj_id: row for row, obj_id in enumerate(obj_ids)}, locations.reshape(-1, 2))
+        return self.__locations
+
+    def __get_traversable(self):
+        # Which (x, y) locations are traversable, which they are when there is no intraversable object at them
+        if self.__traversable is not None:
+            return self.__traversable
+
+        # We count the intraversable objects at each location. These counts are updated from the state they were last
+        # counted in by only looking at the objects that changed since, unless that is a large part of them.
+        shape = tuple(self.get_world_info()['grid_shape'])
+        counts = None
+        if self.__intraversable_counts is not None and self.__intraversable_counts[1].shape == shape:
+            prev_state, prev_counts = self.__intraversable_counts
+            changed_ids = [obj_id for obj_id, obj in self.__state_dict.items() if prev_state.get(obj_id) is not obj]
+            changed_ids.extend(prev_state.keys() - self.__state_dict.keys())
+            if len(changed_ids) <= len(self.__state_dict) // 4:
+                counts = prev_counts.copy()
+                for obj_id in changed_ids:
+                    _count_intraversable(counts, prev_state.get(obj_id), -1)
+                    _count_intraversable(counts, self.__state_dict.get(obj_id), 1)
+        if counts is None:
+            counts = np.zeros(shape, dtype=int)
+            for obj in self.__state_dict.values():
+                _count_intraversable(counts, obj, 1)
+        self.__intraversable_counts = (self.__state_dict.copy(), counts)
+
+        self.__traversable = counts == 0
+        self.__traversable.flags.writeable = False
+        return self.__traversable
+
+    def __get_path_distances(self, start):
+        # The number of horizontal and vertical steps from the start to every location, over traversable locations.
+        # Locations that are not traversable themselves can be reached, but not passed through.
+        if self.__path_distances is not None and self.__path_distances[0] == start:
+            return self.__path_distances[1]
+
+        traversable = self.__get_traversable()
+        width, height = traversable.shape
+        distances = np.full((width, height), np.inf)
+        distances[start] = 0
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for x, y in frontier:
+                for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                    if 0 <= nx < width and 0 <= ny < height and distances[nx, ny] == np.inf:
+                        distances[nx, ny] = distances[x, y] + 1
+                        if traversable[nx, ny]:
+                            next_frontier.append((nx, ny))
+            frontier = next_frontier
+
+        self.__path_distances = (start, distances)
+        return distances
 
     def __find_object(self, props, combined):
-        # Make sure that props is a dict, with as keys the property names and as values a tuple of allowable property
-        # values (which can be (None,) if no value is specified).
-        if isinstance(props, dict):
-            # if props is a dict, we check if its values are tuples and cast them to tuples when there are any iterable
-            # and wrap them in a tuple if it is a single value.
-            props = {p: v if isinstance(v, tuple) else tuple(v) if State.__is_iterable(v) else tuple([v])
-                     for p, v in props.items()}
-        elif isinstance(props, str):  # props is a single string
-            # It could be that props is in fact an "obj_id", the only value allowed to be passed and return something so
-            # we check if it is in our dict and return it.
-            if props in self.__state_dict.keys():
-                found = [self.__state_dict[props]]
-                return found
-            # props is a single property, so make a appropriate dict out of it with no value
-            props = {props: (None, )}
-        elif State.__is_iterable(props):
-            # props is a list, and it may be a list of object ids so first check if this is the case
-            found = [self.__state_dict[obj_id] for obj_id in props if obj_id in self.__state_dict.keys()]
-            if len(found) != len(props):  # if one given prop_name was not an actual obj_id, treat all as property names
-                # props is a list, assuming a list of property names.
-                props = {p: (None,) for p in props}
-            else:  # all property names were in fact keys, so return what we found
+        # Parse the query, unless it was already compiled with State.compile_query (which then sets combined)
+        query = props if isinstance(props, StateQuery) else StateQuery(props, combined)
+        return self._execute_query(query)
+
+    def _execute_query(self, query):
+        """ Returns the objects found with a StateQuery in this state, or None when nothing was found. """
+        # The query could be one or more object IDs, which is the case when all of them are in this state
+        if query.obj_ids is not None:
+            found = [self.__state_dict[obj_id] for obj_id in query.obj_ids if obj_id in self.__state_dict.keys()]
+            if len(found) == len(query.obj_ids):
                 return found
+        props, combined = query.props, query.combined
+
+        # Answer the query from the results of the same query on this state, if any. Found objects are returned in a
+        # new list each time, so changes to that list do not end up in our results.
+        if query.key is not None and query.key in self.__query_results:
+            self.__query_hits[query.key] += 1
+            found = self.__query_results[query.key]
+            return None if found is None else list(found)
+        self.__query_misses += 1
 
         # For each prop_name, prop_value combination, find the relevant objects. If there are more than one allowable
         # property value, search for those as well.
@@ -553,9 +757,62 @@ class State(MutableMapping):
         if not found:
             found = None
 
+        if query.key is not None:
+            self.__query_results[query.key] = None if found is None else list(found)
+
         return found
 
+    def __unshare(self):
+        # Copy the dictionaries this state shares with a copy of it (see State.copy), before changing them
+        if not self.__shared:
+            return
+        self.__state_dict = self.__state_dict.copy()
+        self.__perceived_ids = self.__perceived_ids.copy()
+        self.__remembered = self.__remembered.copy()
+        self.__expiries = self.__expiries.copy()
+        self.__expiry_heap = self.__expiry_heap.copy()
+        self.__id_order = self.__id_order.copy()
+        self.__shared = False
+
+    def __state_changed(self, removed_id=None):
+        # An object removed from the state is no longer remembered either
+        if removed_id is not None:
+            self.__remembered.pop(removed_id, None)
+            self.__expiries.pop(removed_id, None)
+
+        # Drop the indexes of the previous state, they are rebuilt for the properties that are searched for again
+        self.__indexes = {}
+        self.__positions = None
+        self.__query_results = {}
+        self.__locations = None
+        self.__traversable = None
+        self.__path_distances = None
+
     def __find(self, prop_name, prop_value=None):
+        # Values that can not be hashed can not be looked up in an index, so then we check every object
+        try:
+            hash(prop_value)
+        except TypeError:
+            return self.__find_by_scan(prop_name, prop_value)
+
+        # Build an index of the property the first time it is searched for in this state
+        index = self.__indexes.get(prop_name)
+        if index is None:
+            index = _PropertyIndex(prop_name, self.__state_dict)
+            self.__indexes[prop_name] = index
+
+        if prop_value is None:
+            return [self.__state_dict[obj_id] for obj_id in index.obj_ids]
+
+        # Return the found objects in the same order as they are in the state
+        obj_ids = index.find(prop_value)
+        if len(obj_ids) > 1:
+            if self.__positions is None:
+                self.__positions = {obj_id: idx for idx, obj_id in enumerate(self.__state_dict.keys())}
+            obj_ids = sorted(obj_ids, key=self.__positions.__getitem__)
+        return [self.__state_dict[obj_id] for obj_id in obj_ids]
+
+    def __find_by_scan(self, prop_name, prop_value=None):
         # A local function that identifies whether a given obj_id-obj pair has the requested property name and, if
         # given, the right property value. Is used in the map method to find all object that adhere to it.
         def locate(id_obj_pair):
@@ -578,9 +835,110 @@ class State(MutableMapping):
         located = map(locate, self.__state_dict.items())
         return [l for l in located if l is not None]  # only return the found objects
 
-    @staticmethod
-    def __is_iterable(arg):
-        # Checks if the arg functions as an iterable (e.g. is a list, tuple, set, dict, etc.). The isinstance method
-        # would be less specific or very large to include all desirable types. Since, isinstance(arg, Iterable) would
-        # also pass for any strings, but isinstance(arg, (list, tuple, dict, set, array, ...)) grows quite large.
-        return not hasattr(arg, "strip") and (hasattr(arg, "__getitem__") or hasattr(arg, "__iter__"))
+
+def _count_intraversable(counts, obj, delta):
+    # Adds delta to the count of intraversable objects at the object's location, if it is an intraversable object
+    if obj is not None and 'location' in obj and not obj.get('is_traversable', True):
+        counts[obj['location'][0], obj['location'][1]] += delta
+
+
+class StateQuery:
+    """ A query on a State that is parsed once, such that it can be executed on any state without parsing it again.
+    Create one with State.compile_query.
+    """
+
+    def __init__(self, props, combined=True):
+        self.combined = combined
+        self.obj_ids = None  # the object IDs the query might consist of, which is checked on each state
+
+        # Make sure that props is a dict, with as keys the property names and as values a tuple of allowable property
+        # values (which can be (None,) if no value is specified).
+        if isinstance(props, dict):
+            # if props is a dict, we check if its values are tuples and cast them to tuples when there are any iterable
+            # and wrap them in a tuple if it is a single value.
+            props = {p: v if isinstance(v, tuple) else tuple(v) if _is_iterable(v) else tuple([v])
+                     for p, v in props.items()}
+        elif isinstance(props, str):  # props is a single string
+            # It could be that props is in fact an "obj_id", the only value allowed to be passed and return something.
+            # Otherwise props is a single property, so make a appropriate dict out of it with no value
+            self.obj_ids = [props]
+            props = {props: (None, )}
+        elif _is_iterable(props):
+            # props is a list, and it may be a list of object ids. Otherwise it is a list of property names.
+            self.obj_ids = list(props)
+            props = {p: (None,) for p in props}
+        self.props = props
+
+        # The key under which the results of this query are remembered, if all property values can be hashed
+        try:
+            self.key = (tuple(props.items()), combined)
+            hash(self.key)
+        except TypeError:
+            self.key = None
+
+    def __call__(self, state):
+        """ Executes this query on a state, and returns the found object(s) just like `state[...]` does. """
+        found_objects = state._execute_query(self)
+        if found_objects is not None and len(found_objects) == 1:  # just a single object
+            return found_objects[0]
+        return found_objects
+
+
+def _is_iterable(arg):
+    # Checks if the arg functions as an iterable (e.g. is a list, tuple, set, dict, etc.). The isinstance method
+    # would be less specific or very large to include all desirable types. Since, isinstance(arg, Iterable) would
+    # also pass for any strings, but isinstance(arg, (list, tuple, dict, set, array, ...)) grows quite large.
+    return not hasattr(arg, "strip") and (hasattr(arg, "__getitem__") or hasattr(arg, "__iter__"))
+
+
+class _PropertyIndex:
+    """ An index of the values of a single property of all objects in a state. It finds the objects whose value equals
+    a given value or contains it (e.g. as a substring or list item) without checking every object.
+    """
+
+    def __init__(self, prop_name, state_dict):
+        self.obj_ids = []  # the IDs of all objects with the property, in the order of the state
+        self.__equal = {}  # the object IDs with each hashable value
+        self.__strings = []  # all distinct string values, which are checked one by one for substrings
+        self.__items = {}  # the object IDs with each item in list and tuple values
+        self.__others = []  # the value and object ID of all other values, which are checked one by one
+
+        for obj_id, obj in state_dict.items():
+            if prop_name not in obj:
+                continue
+            self.obj_ids.append(obj_id)
+            value = obj[prop_name]
+
+            if isinstance(value, (list, tuple)):
+                try:
+                    items = set(value)
+                except TypeError:  # not all items can be hashed
+                    self.__others.append((value, obj_id))
+                    continue
+                for item in items:
+                    self.__items.setdefault(item, []).append(obj_id)
+                if isinstance(value, tuple):
+                    self.__equal.setdefault(value, []).append(obj_id)
+            elif isinstance(value, str):
+                if value not in self.__equal:
+                    self.__strings.append(value)
+                self.__equal.setdefault(value, []).append(obj_id)
+            elif isinstance(value, Iterable):
+                self.__others.append((value, obj_id))
+            else:
+                try:
+                    self.__equal.setdefault(value, []).append(obj_id)
+                except TypeError:  # the value can not be hashed
+                    self.__others.append((value, obj_id))
+
+    def find(self, prop_value):
+        """ Returns the set of IDs of all objects whose value equals the given (hashable) value, or contains it. """
+        found = set(self.__equal.get(prop_value, ()))
+        found.update(self.__items.get(prop_value, ()))
+        for value in self.__strings:
+            if prop_value in value:
+                found.update(self.__equal[value])
+        for value, obj_id in self.__others:
+            if prop_value == value or (isinstance(value, Iterable) and prop_value in value):
+                found.add(obj_id)
+        return found
@@ -1,10 +1,18 @@
+import heapq
 import warnings
+from collections import OrderedDict
+from types import MappingProxyType
 
 import numpy as np
 
 from matrx.utils import get_distance
-import itertools
-from matrx.agents.agent_utils.fov import _field_of_view
+from matrx.agents.agent_utils.fov import _visibility_mask
+
+# The width and height of the cells in which the remembered objects are indexed by location
+_CELL_SIZE = 8
+
+# The number of visibility masks a StateTracker keeps, for the most recently used agent locations and radii
+_NR_VISIBILITY_MASKS = 64
 
 
 class StateTracker:
@@ -15,7 +23,7 @@ class StateTracker:
 
     """
 
-    def __init__(self, agent_id, knowledge_decay=10, fov_occlusion=True):
+    def __init__(self, agent_id, knowledge_decay=10, fov_occlusion=False):
         """ Create an instance to track an agent's observations over ticks.
 
         Parameters
@@ -25,7 +33,8 @@ class StateTracker:
         knowledge_decay : int
             For how many ticks observations need to be remembered when not observed.
         fov_occlusion : bool
-            Whether intraversable objects should block the agent's field of view or not.
+            Whether intraversable objects should block the agent's field of view or not. Objects that are occluded are
+            not memorized, and memorized objects at occluded locations are not forgotten because they are not seen.
 
         .. deprecated:: 2.0.7
             `StateTracker` will be removed in MATRX v2.2 and fully replaced by `State`.
@@ -48,6 +57,8 @@ class StateTracker:
             self.__decay = 0.0
         else:
             self.__decay = knowledge_decay
+        # The decay of a perceived object is one, after how many updates without perceiving it is it forgotten
+        self.__memory_updates = _nr_updates_until_forgotten(1.0, self.__decay)
 
         # Set the agent's sense capability, needed for FOV occlusion to find the max view radius
         # The sense capability is fetched from the state in the update function
@@ -59,10 +70,26 @@ class StateTracker:
         # We store the agent id of which we track the state so we know what object in the state belongs to the agent
         self.agent_id = agent_id
 
-        # here we store our information, a regular state dict
+        # here we store our information, a regular state dict. Once handed out by get_memorized_state it is no longer
+        # changed, instead we change a copy of it on the next update.
         self.__memorized_state = {}
-        # our dict in which we keep track of the decays of each object
-        self.__decay_values = {}
+        self.__memorized_state_shared = False
+        self.__ids_at = {}  # the IDs of the memorized objects at each location
+
+        # Instead of decaying all objects with each update, we only keep track of the objects no longer perceived and
+        # when each of those will be forgotten.
+        self.__nr_updates = 0  # the number of updates so far
+        self.__perceived_ids = set()  # the IDs of the objects perceived in the last update
+        self.__remembered = {}  # (decay, update, cell) of objects no longer perceived; their decay at some update
+        self.__expiries = {}  # the update at which each remembered object is forgotten (None for never)
+        self.__expiry_heap = []  # (expiry, object ID) of remembered objects, some outdated as they were perceived again
+        self.__cells = {}  # the IDs of the remembered objects in each cell of _CELL_SIZE by _CELL_SIZE locations
+
+        # The visible locations only change when the agent moves or an object blocking the view is added, removed or
+        # moved, which the GridWorld tracks with the opacity version in the world info of each state. So we keep the
+        # visibility masks of the most recently used locations for as long as that version stays the same.
+        self.__visibility_masks = OrderedDict()  # by (location, radius, opacity version), least recently used first
+        self.__visibility_of = None  # the world ID, opacity version and sense capability of the cached masks
 
     def set_knowledge_decay(self, knowledge_decay):
         """ Sets the number of ticks the tracker should memorize unobserved objects.
@@ -73,18 +100,49 @@ class StateTracker:
             The number of ticks an unobserved object is memorized.
 
         """
+        # Objects no longer perceived decayed with the old decay so far and decay with the new one from now on
+        for obj_id, (decay, update, cell) in self.__remembered.items():
+            for _ in range(self.__nr_updates - update):
+                decay -= self.__decay
+            self.__remembered[obj_id] = (decay, self.__nr_updates, cell)
+
         self.__decay = knowledge_decay
+        self.__memory_updates = _nr_updates_until_forgotten(1.0, self.__decay)
+
+        self.__expiries = {}
+        self.__expiry_heap = []
+        for obj_id, (decay, _, _) in self.__remembered.items():
+            self.__set_expiry(obj_id, self.__nr_updates, decay)
 
     def get_memorized_state(self):
         """ Returns the memorized state so far.
 
         Returns
         -------
-        dict
-            The dictionary containing all current and memorized observations.
+        MappingProxyType
+            A read-only dictionary containing all current and memorized observations. It does not change when this
+            tracker is updated, so it can be handed out without copying it. Use `dict(...)` to get a copy that can be
+            changed.
 
         """
-        return self.__memorized_state.copy()
+        self.__memorized_state_shared = True
+        return MappingProxyType(self.__memorized_state)
+
+    def get_objects_at(self, location):
+        """ Returns the memorized objects at a location.
+
+        Parameters
+        ----------
+        location : tuple
+            The (x, y) location.
+
+        Returns
+        -------
+        list
+            The properties of all current and memorized observations at that location.
+
+        """
+        return [self.__memorized_state[obj_id] for obj_id in self.__ids_at.get(tuple(location), ())]
 
     def update(self, state):
         """ Updates this tracker with the new observations.
@@ -98,36 +156,70 @@ class StateTracker:
 
         Returns
         -------
-        dict
-            The dictionary containing all current and memorized observations.
+        MappingProxyType
+            A read-only dictionary containing all current and memorized observations.
 
         """
-        # Decay all objects in our memory
-        for obj_id in self.__decay_values.keys():
-            self.__decay_values[obj_id] -= self.__decay
+        # Copy our memorized state before changing it, if it was handed out
+        if self.__memorized_state_shared:
+            self.__memorized_state = dict(self.__memorized_state)
+            self.__memorized_state_shared = False
+        self.__nr_updates += 1
+
+        self.sense_capability = state[self.agent_id]['sense_capability']  # get the agent's sense capability
+        agent_loc = state[self.agent_id]['location']  # get the agent's location
 
-        # Check if we need to remove an object
-        temp_decay_values = list(self.__decay_values.items()).copy()
-        for obj_id, decay in temp_decay_values:
-            if decay < 0:
-                self.__memorized_state.pop(obj_id)
-                self.__decay_values.pop(obj_id)
+        # Objects that are occluded are not perceived
+        visible = None
+        if self.fov_occlusion:
+            visible = self.__get_visibility_mask(state)
+            occluded_ids = self.__get_occluded_objects(state, visible)
+            if occluded_ids:
+                occluded_ids = set(occluded_ids)
+                state = {obj_id: properties for obj_id, properties in state.items() if obj_id not in occluded_ids}
+
+        # Forget the objects whose decay dropped below zero with this update. Those perceived in the last update have a
+        # decay of one, which only drops below zero at once if the decay is larger than one.
+        if self.__memory_updates == 1:
+            for obj_id in self.__perceived_ids:
+                if obj_id in self.__memorized_state:
+                    self.__unmemorize(obj_id)
+        while self.__expiry_heap and self.__expiry_heap[0][0] <= self.__nr_updates:
+            expiry, obj_id = heapq.heappop(self.__expiry_heap)
+            if self.__expiries.get(obj_id) == expiry:
+                self.__unmemorize(obj_id)
+                self.__forget(obj_id)
+
+        # The objects perceived in the last update but no longer now, are from now on remembered with a decay of one
+        for obj_id in self.__perceived_ids.difference(state.keys()):
+            if obj_id in self.__memorized_state:
+                self.__remember(obj_id, 1.0, self.__nr_updates - 1)
 
         # Loop over the given state and update our memorized state
+        ids_at = self.__ids_at
         for obj_id, properties in state.items():
             # the object is new for our memory, previously forgotten or already in our memory and we update it
+            old_properties = self.__memorized_state.get(obj_id)
             self.__memorized_state[obj_id] = properties
-            self.__decay_values[obj_id] = 1.0  # (re)set the memory decay
+            if obj_id in self.__remembered:
+                self.__forget(obj_id)  # no longer remembered, as we perceive it again
+
+            # keep the location index up to date, if the object is new or moved
+            if obj_id == "World":
+                continue
+            loc = tuple(properties['location'])
+            if old_properties is None:
+                ids_at.setdefault(loc, set()).add(obj_id)
+            elif tuple(old_properties['location']) != loc:
+                self.__unindex(obj_id, old_properties['location'])
+                ids_at.setdefault(loc, set()).add(obj_id)
+        self.__perceived_ids = set(state.keys())
 
         # Now check if there is an object that we memorized to be at some place we should still be able to perceive but
         # did not find that object there
-        self.sense_capability = state[self.agent_id]['sense_capability']  # get the agent's sense capability
-        agent_loc = state[self.agent_id]['location']  # get the agent's location
-        temp_memorized_state = list(self.__memorized_state.items()).copy()
-        for obj_id, properties in temp_memorized_state:
-            # We only remove it if it is also not in the given state (since then we updated it just now!)
-            if obj_id in state.keys():
-                continue
+        max_range = max(self.sense_capability.values(), default=-1)
+        for obj_id in self.__remembered_in_range(agent_loc, max_range):
+            properties = self.__memorized_state[obj_id]
 
             # Get the location, distance and object class
             loc = properties['location']  # location of memorized object
@@ -142,14 +234,75 @@ class StateTracker:
             else:
                 perceive_range = -1
 
-            # check if obj is in range and is not in state anymore
-            if distance <= perceive_range:
-                self.__memorized_state.pop(obj_id)
-                self.__decay_values.pop(obj_id)
+            # check if obj is in range and is not in state anymore, while its location is not occluded
+            if distance <= perceive_range and (visible is None or visible[loc[0], loc[1]]):
+                self.__unmemorize(obj_id)
+                self.__forget(obj_id)
 
         return self.get_memorized_state()
 
-    def __get_occluded_objects(self, state):
+    def __remember(self, obj_id, decay, update):
+        """ Starts remembering a memorized object that is no longer perceived, which had the given decay at the given
+        update. """
+        loc = self.__memorized_state[obj_id]['location']
+        cell = (loc[0] // _CELL_SIZE, loc[1] // _CELL_SIZE)
+        self.__remembered[obj_id] = (decay, update, cell)
+        self.__cells.setdefault(cell, set()).add(obj_id)
+        self.__set_expiry(obj_id, update, decay)
+
+    def __set_expiry(self, obj_id, update, decay):
+        """ Sets the update at which a remembered object is forgotten, given its decay at some update. """
+        # Objects start being remembered with a decay of one, for which we already know this number
+        if decay == 1.0:
+            nr_updates = self.__memory_updates
+        else:
+            nr_updates = _nr_updates_until_forgotten(decay, self.__decay)
+        if nr_updates is None:
+            self.__expiries[obj_id] = None
+        else:
+            self.__expiries[obj_id] = update + nr_updates
+            heapq.heappush(self.__expiry_heap, (update + nr_updates, obj_id))
+
+    def __unmemorize(self, obj_id):
+        """ Removes an object from the memorized state. """
+        properties = self.__memorized_state.pop(obj_id)
+        if obj_id != "World":
+            self.__unindex(obj_id, properties['location'])
+
+    def __unindex(self, obj_id, location):
+        """ Removes an object from the location index at its previous location. """
+        location = tuple(location)
+        ids_at_loc = self.__ids_at[location]
+        ids_at_loc.discard(obj_id)
+        if not ids_at_loc:
+            del self.__ids_at[location]
+
+    def __forget(self, obj_id):
+        """ Stops remembering an object, because it is forgotten or perceived again. """
+        _, _, cell = self.__remembered.pop(obj_id)
+        self.__expiries.pop(obj_id)
+        ids_in_cell = self.__cells[cell]
+        ids_in_cell.discard(obj_id)
+        if not ids_in_cell:
+            del self.__cells[cell]
+
+    def __remembered_in_range(self, location, sense_range):
+        """ Returns the IDs of the remembered objects in the cells within the sense range of the location, which
+        contain all remembered objects within that range. """
+        if sense_range < 0:
+            return []
+        if sense_range >= np.inf:
+            return list(self.__remembered.keys())
+        min_x, max_x = (location[0] - sense_range) // _CELL_SIZE, (location[0] + sense_range) // _CELL_SIZE
+        min_y, max_y = (location[1] - sense_range) // _CELL_SIZE, (location[1] + sense_range) // _CELL_SIZE
+        if (max_x - min_x + 1) * (max_y - min_y + 1) >= len(self.__cells):
+            cells = list(self.__cells.keys())
+        else:
+            cells = [(x, y) for x in range(int(min_x), int(max_x) + 1) for y in range(int(min_y), int(max_y) + 1)
+                     if (x, y) in self.__cells]
+        return [obj_id for cell in cells for obj_id in self.__cells[cell]]
+
+    def __get_occluded_objects(self, state, visible=None):
         """ A private MATRX method.
 
         Applies the Field of View (FOV) algorithm.
@@ -158,6 +311,9 @@ class StateTracker:
         ----------
         state : dict
             The dictionary representing the agent's (memorized) observations to be used to create the map.
+        visible : np.ndarray (optional, default None)
+            The visibility mask of the agent's location in this state, see __get_visibility_mask. Obtained from the
+            state when not given.
 
         Returns
         -------
@@ -165,31 +321,76 @@ class StateTracker:
             The list of objects that are being occluded by other objects.
 
         """
-        loc = state[self.agent_id]["location"]
-        map_size = state['World']['grid_shape']
+        if visible is None:
+            visible = self.__get_visibility_mask(state)
 
-        radius = max(self.sense_capability.get_capabilities().values())
-        if radius >= np.inf:
-            radius = max(map_size)
+        # Any object at a location that is not visible is occluded
+        obj_ids = [obj_id for obj_id in state.keys() if obj_id != "World"]
+        locations = np.array([state[obj_id]['location'] for obj_id in obj_ids], dtype=int).reshape(-1, 2)
+        is_occluded = ~visible[locations[:, 0], locations[:, 1]]
+
+        return [obj_id for obj_id, occluded in zip(obj_ids, is_occluded) if occluded]
 
-        traverse_grid, obj_grid = self.get_traversability_map(inverted=True, state=state)
-        objects_seen = []
+    def __get_visibility_mask(self, state):
+        """ A private MATRX method.
 
-        sees = np.zeros(map_size)
+        Returns a read-only boolean array of the grid's (width, height) that is True at each location visible from the
+        agent's location in the state. Intraversable objects other than the agent itself block the view.
 
-        def func_visit_tile(x, y):
-            sees[x, y] = 1
-            objects_seen.extend(obj_grid[x][y])
+        The mask is taken from the cache when it was computed before for the same location, radius and opacity version
+        (see the world info of the state), which assumes the tracker is updated with the states the agent perceives.
+        States without an opacity version are never cached.
 
-        def func_tile_blocked(x, y):
-            return bool(traverse_grid[x, y])
+        """
+        loc = tuple(state[self.agent_id]["location"])
+        world_info = state['World']
+        map_size = world_info['grid_shape']
 
-        _field_of_view(loc[0], loc[1], map_size[0], map_size[1], radius, func_visit_tile, func_tile_blocked)
+        radius = max(self.sense_capability.values())
+        if radius >= np.inf:
+            radius = max(map_size)
 
-        all_objects = list(itertools.chain(*itertools.chain(*obj_grid)))
-        occluded_objects = [obj_id for obj_id in all_objects if obj_id not in objects_seen]
+        # The cached masks are of the previous opacity version in the same world, and the same sense capability (as
+        # that determines which of the objects that block the view are perceived)
+        version = world_info.get('opacity_version')
+        visibility_of = (world_info.get('world_ID'), version, self.sense_capability)
+        if visibility_of != self.__visibility_of:
+            self.__visibility_masks.clear()
+            self.__visibility_of = (visibility_of[0], version, dict(self.sense_capability))
+
+        key = (loc, radius, version)
+        visible = self.__visibility_masks.get(key)
+        if visible is not None:
+            self.__visibility_masks.move_to_end(key)
+            return visible
+
+        # The agent itself never blocks its own view, leaving it out keeps the opacity grid the same while it moves
+        obj_ids = [obj_id for obj_id in state.keys() if obj_id != "World" and obj_id != self.agent_id]
+        blocking = [state[obj_id]['location'] for obj_id in obj_ids if not state[obj_id]['is_traversable']]
+        blocking = np.array(blocking, dtype=int).reshape(-1, 2)
+        opacity = np.zeros(map_size, dtype=bool)
+        opacity[blocking[:, 0], blocking[:, 1]] = True
+
+        visible = _visibility_mask(opacity, loc[0], loc[1], radius)
+        visible.flags.writeable = False
+        if version is not None:
+            if len(self.__visibility_masks) >= _NR_VISIBILITY_MASKS:
+                self.__visibility_masks.popitem(last=False)
+            self.__visibility_masks[key] = visible
+        return visible
+
+
+def _nr_updates_until_forgotten(decay, decay_per_update):
+    """ Returns after how many updates an object with the given decay is forgotten, as its decay then drops below
+    zero, or None if it is never forgotten. """
+    if decay_per_update <= 0:
+        return None
+    nr_updates = 0
+    while decay >= 0:
+        decay -= decay_per_update
+        nr_updates += 1
+    return nr_updates
 
-        return occluded_objects
 
 def get_traversability_map(state=None, inverted=True):
     """ Returns a map where the agent can move to. Traversability is binary.
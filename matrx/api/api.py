@@ -68,6 +68,37 @@ def get_info():
     _MATRX_info['matrx_version'] = _matrx_version
     return jsonify(_MATRX_info)
 
+
+@__app.route('/get_tick_timings/', methods=['GET', 'POST'])
+@__app.route('/get_tick_timings', methods=['GET', 'POST'])
+@__app.route('/get_tick_timings/<nr_ticks>/', methods=['GET', 'POST'])
+@__app.route('/get_tick_timings/<nr_ticks>', methods=['GET', 'POST'])
+def get_tick_timings(nr_ticks=None):
+    """ Provides how long each phase (goal check, logging, agent states and decisions, messages, actions, object
+    updates, etc.) of the most recent ticks took. See GridWorld.get_tick_timings.
+
+    API Path: ``http://>MATRX_core_ip<:3001/get_tick_timings/<nr_ticks>``
+
+    Parameters
+    ----------
+    nr_ticks
+        Optional, the number of most recent ticks to return the timings of. Returns all kept ticks when not given.
+
+    Returns
+    -------
+        A list with the timings of each tick, from the oldest to the most recent tick.
+    """
+    if _gw is None:
+        return __return_error(code=400, message="MATRX is not running a world.")
+
+    if nr_ticks is not None:
+        try:
+            nr_ticks = int(nr_ticks)
+        except ValueError:
+            return __return_error(code=400, message=f"The number of ticks should be an integer, but is {nr_ticks}.")
+
+    return jsonify(_gw.get_tick_timings(nr_ticks=nr_ticks))
+
 @__app.route('/get_latest_state_and_messages/', methods=['GET', 'POST'])
 @__app.route('/get_latest_state_and_messages', methods=['GET', 'POST'])
 def get_latest_state_and_messages():
@@ -979,8 +1010,15 @@ def __reorder_state(state):
     for objID, obj in state.items():
 
         if objID != "World":
+            # lazily built properties (see GridWorld) are built in full, into a new dictionary
+            if not isinstance(obj, dict):
+                new_state[objID] = dict(obj)
+
             # make the sense capability JSON serializable
             if "sense_capability" in obj:
+                # copy the object first, as its properties are shared with the world state
+                if new_state[objID] is obj:
+                    new_state[objID] = copy.copy(obj)
                 new_state[objID]["sense_capability"] = str(obj["sense_capability"])
 
     return new_state
@@ -39,3 +39,4 @@ GRIDWORLD_RUN_API = False
 GRIDWORLD_SIM_GOAL_ARGUMENTS = {
     "max_nr_ticks": -1
 }
+GRIDWORLD_NR_TICK_TIMINGS = 1000  # the number of most recent ticks of which the GridWorld keeps the phase timings
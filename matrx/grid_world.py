@@ -1,16 +1,22 @@
-import datetime
+import heapq
+import itertools
+import math
+import multiprocessing
 import os.path
+import traceback
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import time
 import copy
 
 import gevent
 
+import matrx.defaults as defaults
 from matrx.actions.object_actions import *
 from matrx.goals import WorldGoalV2
 from matrx.logger.logger import GridWorldLogger, GridWorldLoggerV2
 from matrx.agents.agent_utils.state import State
+from matrx.objects.entity_table import EntityTable
 from matrx.objects.env_object import EnvObject
 from matrx.objects.standard_objects import AreaTile
 from matrx.messages.message_manager import MessageManager
@@ -18,12 +24,31 @@ from matrx.objects.agent_body import _get_all_classes
 from matrx.api import api
 
 
+# The ticks between which there are storms, in which the human agent decides while busy (see GridWorld.__agent_decides)
+_STORMS = [(950, 1050), (1850, 1950), (2750, 2850)]
+
+# The tiles of the areas in which the human agent can shelter during the storms
+_AREA_TILES = [(2, 2), (2, 3), (3, 2), (3, 3), (4, 2), (4, 3), (8, 2), (8, 3), (9, 2), (9, 3), (10, 2), (10, 3), (14, 2), (14, 3), (15, 2), (15, 3), (16, 2), (16, 3), (20, 2), (20, 3),
+            (21, 2), (21, 3), (22, 2), (22, 3), (2, 8), (2, 9), (3, 8), (3, 9), (4, 8), (4, 9), (8, 8), (8, 9), (9, 8), (9, 9), (10, 8), (10, 9), (14, 8), (14, 9), (15, 8), (15, 9),
+            (16, 8), (16, 9), (2, 14), (2, 15), (3, 14), (3, 15), (4, 14), (4, 15), (8, 14), (8, 15), (9, 14), (9, 15), (10, 14), (10, 15), (14, 14), (14, 15), (15, 14), (15, 15), (16, 14),
+            (16, 15), (2, 20), (2, 21), (3, 20), (3, 21), (4, 20), (4, 21), (8, 20), (8, 21), (9, 20), (9, 21), (10, 20), (10, 21), (14, 20), (14, 21), (15, 20), (15, 21), (16, 20), 
+            (16, 21), (20, 20), (20, 21), (21, 20), (21, 21), (22, 20), (22, 21), (23, 8), (23, 9), (23, 10), (23, 11), (23, 12), (23, 13), (23, 14), (23, 15),
+            (3, 4), (9, 4), (15, 4), (21, 4), (3, 7), (9, 7), (15, 7), (3, 16), (9, 16), (15, 16), (3, 19), (9, 19), (15, 19), (21, 19)]
+
+
 class GridWorld:
     """  The Gridworld is the representation of the world and the core of MATRX
     """
 
+    # The policies to catch up with the tick schedule after ticks that took longer than the tick duration
+    SKIP_SLEEP_CATCH_UP = "skip_sleep"
+    DROP_FRAMES_CATCH_UP = "drop_frames"
+    STRICT_CATCH_UP = "strict"
+
     def __init__(self, shape, tick_duration, simulation_goal, rnd_seed=1,
-                 visualization_bg_clr="#C2C2C2", visualization_bg_img=None, verbose=False, world_id=0):
+                 visualization_bg_clr="#C2C2C2", visualization_bg_img=None, verbose=False, world_id=0,
+                 headless=False, agent_processes=None, tick_catch_up=SKIP_SLEEP_CATCH_UP, entity_table=False,
+                 lazy_properties=False):
 
         """ Create a GridWorld instance.
 
@@ -65,6 +90,38 @@ class GridWorld:
            The ID of this world. Every new GridWorld instance should have a unique ID, such that the frontend knows
            when it has to reinitialize the visualization.
 
+        headless : bool (optional, False)
+           Whether this GridWorld runs headless, without the API. When True the GridWorld never sleeps to hold the
+           tick duration, but ticks as fast as possible. It then also warps through the ticks in which all agents are
+           busy with an action and have a stateless brain (see AgentBrain.stateless), and no object updates itself.
+
+        agent_processes : int (optional, None)
+           The number of worker processes in which the agents that are not human agents decide on their actions in
+           parallel. The brain of each of these agents is sent to one of the processes when this GridWorld is
+           initialized and stays there until it stops running, receiving only what changed in its state each tick.
+           These agents all observe the world as it was at the start of the tick, and their decisions are processed
+           in the order of the registered agents, so each tick has the same outcome regardless of which agent is done
+           first. This is only faster when each worker process has a CPU core of its own. When None, all agents
+           decide one after another in this process.
+
+        tick_catch_up : str (optional, GridWorld.SKIP_SLEEP_CATCH_UP)
+           How to catch up with the tick schedule after ticks that took longer than the tick duration. Each tick is
+           scheduled to end one tick duration after the scheduled end of the previous tick. With
+           GridWorld.SKIP_SLEEP_CATCH_UP the GridWorld does not sleep until it is back on schedule. With
+           GridWorld.DROP_FRAMES_CATCH_UP it also does not send the states of the ticks behind schedule to the API
+           (and any visualizer). With GridWorld.STRICT_CATCH_UP ticks that took too long are not compensated, each
+           tick simply lasts at least the tick duration.
+
+        entity_table : bool (optional, False)
+           Whether to keep the location, traversability and type of all objects and agents in an EntityTable of
+           NumPy arrays, such that finding the objects in range of a location is vectorized and the move actions look
+           up whether a location is occupied without going through the objects there. This is worthwhile for worlds
+           with many objects; the table is available via GridWorld.entity_table.
+
+        lazy_properties : bool (optional, False)
+           Whether the states of agents hold a LazyProperties for each object whose properties changed since they were
+           last built, which only builds them once a property other than the most common ones (e.g. the location) is
+           requested. The states sent to the API are always built in full.
 
         Examples
         --------
@@ -84,10 +141,14 @@ class GridWorld:
         self.__visualization_bg_clr = visualization_bg_clr  # The background color of the visualisation
         self.__visualization_bg_img = visualization_bg_img  # The background image of the visualisation
         self.__verbose = verbose  # Set whether we should print anything or not
+        self.__headless = headless  # Set whether we should tick as fast as possible, without the API
+        self.__agent_processes = agent_processes  # The number of worker processes in which agents decide, if any
+        self.__agent_workers = None  # Those worker processes, started when this GridWorld is initialized
         self.world_id = world_id  # ID of this simulation world
 
         self.__teams = {}  # dictionary with team names (keys), and agents in those teams (values)
         self.__registered_agents = OrderedDict()  # The dictionary of all existing agents in the GridWorld
+        self.__agent_brains = {}  # The brain of each registered agent, by agent ID
         self.__environment_objects = OrderedDict()  # The dictionary of all existing objects in the GridWorld
         self.__obj_indices = {} # keeps track of all obj_ids added, indexed by their (preprocessed) obj ID
 
@@ -110,9 +171,31 @@ class GridWorld:
 
         # Get all actions within all currently imported files
         self.__all_actions = _get_all_classes(Action, omit_super_class=True)
+        self.__action_instances = {}  # the single instance of each action used so far, by action name
 
         # Initialise an empty grid, a simple 2D array with ID's
         self.__grid = np.array([[None for _ in range(shape[0])] for _ in range(shape[1])])
+        self.__grid_locations = {}  # the (x, y) grid cell at which each object ID is currently stored in the grid
+        self.__registration_order = {}  # the order in which each object and agent ID was registered
+        self.__registration_counter = itertools.count()
+        self.__entity_table = EntityTable() if entity_table else None  # The table of all objects, if used
+        self.__lazy_properties = lazy_properties  # whether agent states may hold lazily built object properties
+        self.__env_obj_states = {}  # the properties of each environment object, as they are put in the world state
+        # The environment objects are partitioned into static objects, which can not move and do not update themselves,
+        # and dynamic objects. Objects that are static when registered become dynamic if they move anyway.
+        self.__static_objects = OrderedDict()  # the static environment objects, by object ID
+        self.__dynamic_objects = {}  # the dynamic environment objects, by object ID
+        self.__updating_objects = OrderedDict()  # the environment objects that implement their own update, by ID
+        self.__static_objs_in_range = {}  # the static objects found for each location, object type and range
+        self.__changed_obj_ids = set()  # IDs of the environment objects whose properties changed since the last state
+        self.__world_state_version = 0  # increased whenever an object is added, removed or changed its properties
+        self.__world_state_info = None  # the last compiled world state, with the version, tick and agents it was of
+        # Agents can reuse what they computed from the objects that block their view (see StateTracker) until one of
+        # those is added, removed or moved, or an object becomes (in)traversable. Traversability changes are detected
+        # through the properties listeners, and only checked when the version is requested.
+        self.__opacity_version = 0  # increased whenever the locations of intraversable objects and agents change
+        self.__intraversable_ids = set()  # the IDs of the intraversable objects and agents, as last checked
+        self.__traversability_changed_ids = set()  # IDs of objects and agents whose traversability may have changed
 
         self.__api_info = None  # Dict containing info about the API instance
         self.__run_matrx_api = False  # Bool if API is running
@@ -121,6 +204,13 @@ class GridWorld:
         self.__rnd_seed = rnd_seed  # The random seed of this GridWorld
         self.__rnd_gen = np.random.RandomState(seed=self.__rnd_seed)  # The random state of this GridWorld
         self.__curr_tick_duration = 0.  # Duration of the current tick
+        self.__tick_catch_up = tick_catch_up  # How to catch up with the tick schedule when ticks take too long
+        self.__tick_deadline = None  # The time (time.monotonic) at which the previous tick was scheduled to end
+        self.__behind_schedule = False  # Whether the previous tick ended after its scheduled end
+        self.__last_tick_end = None  # The time (time.monotonic) at which the previous tick actually ended
+        self.__tick_drift = 0.  # The seconds all ticks so far took in total longer than scheduled
+        # The time spent in each phase of the most recent ticks, with the oldest ticks dropped first
+        self.__tick_timings = deque(maxlen=defaults.GRIDWORLD_NR_TICK_TIMINGS)
         self.__current_nr_ticks = 0  # The number of tick this GridWorld has ran already
         self.__is_initialized = False  # Whether this GridWorld is already initialized
         self.__message_buffer = {}  # dictionary of messages that need to be send to agents, with receiver ids as keys
@@ -165,9 +255,13 @@ class GridWorld:
             for agent_body in self.__registered_agents.values():
                 agent_body.brain_initialize_func()
 
+            # start the worker processes in which agents decide on their actions, if asked for
+            if self.__agent_processes is not None:
+                self.__start_agent_workers()
+
             # set the api variables
             self.__api_info = api_info
-            self.__run_matrx_api = self.__api_info['run_matrx_api']
+            self.__run_matrx_api = self.__api_info['run_matrx_api'] and not self.__headless
             if self.__run_matrx_api:
                 # initialize this world in the api
                 api._reset_api()
@@ -186,6 +280,7 @@ class GridWorld:
 
                 # init api with world info
                 api._MATRX_info = {
+                    "tick_drift": self.__tick_drift,
                     "nr_ticks": self.__current_nr_ticks,
                     "curr_tick_timestamp": int(round(time.time() * 1000)),
                     "grid_shape": self.__shape,
@@ -237,17 +332,26 @@ class GridWorld:
         if self.__verbose:
             print(f"@{os.path.basename(__file__)}: Starting game loop...")
         is_done = False
-        while not is_done:
-
-            if self.__run_matrx_api and api.matrx_paused:
-                print("MATRX paused through api")
-                gevent.sleep(1)
-            else:
-                is_done, tick_duration = self.__step()
+        try:
+            while not is_done:
+
+                if self.__run_matrx_api and api.matrx_paused:
+                    print("MATRX paused through api")
+                    gevent.sleep(1)
+                    # the tick schedule starts anew when we continue
+                    self.__tick_deadline = None
+                    self.__behind_schedule = False
+                    self.__last_tick_end = None
+                else:
+                    is_done, tick_duration = self.__step()
 
-            if self.__run_matrx_api and api._matrx_done:
-                print("Scenario stopped through api")
-                break
+                if self.__run_matrx_api and api._matrx_done:
+                    print("Scenario stopped through api")
+                    break
+        finally:
+            # stop the worker processes of the agents, if we started them
+            if self.__agent_workers is not None:
+                self.__stop_agent_workers()
 
     def get_env_object(self, requested_id, obj_type=None):
         """ Fetch an object or agent from the GridWorld using its ID, optionally checking for its object type.
@@ -343,18 +447,73 @@ class GridWorld:
         >>> objects_in_range = grid_world.get_objects_in_range([3,3], object_type="*", sense_range=5)
 
         """
-
-        env_objs = OrderedDict()
-        # loop through all environment objects
-        for obj_id, env_obj in self.__environment_objects.items():
-            # get the distance from the agent location to the object
-            coordinates = env_obj.location
-            distance = get_distance(coordinates, agent_loc)
-
+        if self.__entity_table is not None:
+            return OrderedDict((obj.obj_id, obj) for obj in
+                               self.__entity_table.in_range(agent_loc, sense_range, object_type))
+
+        match_all = object_type is None or object_type == "*"
+
+        # Only agents can be of an agent type, so there is no need to look at any other object
+        if not match_all and isinstance(object_type, type) and issubclass(object_type, AgentBody):
+            env_objs = OrderedDict()
+            for agent_id, agent_obj in self.__registered_agents.items():
+                if isinstance(agent_obj, object_type) and get_distance(agent_obj.location, agent_loc) <= sense_range:
+                    env_objs[agent_id] = agent_obj
+            return env_objs
+
+        # Only look at the grid cells within range, unless that would mean visiting more cells than there are objects
+        if sense_range == 0:
+            cells = [(agent_loc[0], agent_loc[1])]
+        elif math.isfinite(sense_range) and \
+                (2 * sense_range + 1) ** 2 < len(self.__environment_objects) + len(self.__registered_agents):
+            min_x, max_x = math.ceil(agent_loc[0] - sense_range), math.floor(agent_loc[0] + sense_range)
+            min_y, max_y = math.ceil(agent_loc[1] - sense_range), math.floor(agent_loc[1] + sense_range)
+            cells = [(x, y) for x in range(max(min_x, 0), min(max_x, self.__shape[0] - 1) + 1)
+                     for y in range(max(min_y, 0), min(max_y, self.__shape[1] - 1) + 1)
+                     if get_distance((x, y), agent_loc) <= sense_range]
+        else:
+            return self.__get_objects_in_range_scan(agent_loc, object_type, sense_range)
+
+        found = []
+        for x, y in cells:
+            if not (0 <= x < self.__shape[0] and 0 <= y < self.__shape[1]) or self.__grid[y, x] is None:
+                continue
+            for obj_id in self.__grid[y, x]:
+                is_agent = obj_id in self.__registered_agents
+                obj = self.__registered_agents[obj_id] if is_agent else self.__environment_objects[obj_id]
+                if match_all or isinstance(obj, object_type):
+                    found.append(((is_agent, self.__registration_order[obj_id]), obj_id, obj))
+
+        # Return them in the same order as a scan over all objects followed by all agents would
+        found.sort(key=lambda item: item[0])
+        return OrderedDict((obj_id, obj) for _, obj_id, obj in found)
+
+    def __get_objects_in_range_scan(self, agent_loc, object_type, sense_range):
+        """ Finds the objects in range by checking every dynamic object and agent, used when the range covers most of
+        the grid. Which static objects are in range is only checked once for each location, object type and range. """
+        match_all = object_type is None or object_type == "*"
+
+        # When the range is infinite, the location does not matter
+        key = (None if math.isinf(sense_range) else tuple(agent_loc), object_type, sense_range)
+        static_objs = self.__static_objs_in_range.get(key)
+        if static_objs is None:
+            static_objs = [(self.__registration_order[obj_id], obj_id, env_obj)
+                           for obj_id, env_obj in self.__static_objects.items()
+                           if (match_all or isinstance(env_obj, object_type))
+                           and get_distance(env_obj.location, agent_loc) <= sense_range]
+            self.__static_objs_in_range[key] = static_objs
+
+        # loop through all dynamic environment objects
+        dynamic_objs = []
+        for obj_id, env_obj in self.__dynamic_objects.items():
             # check if the env object is of the specified type, and within range
-            if (object_type is None or object_type == "*" or isinstance(env_obj, object_type)) and \
-                    distance <= sense_range:
-                env_objs[obj_id] = env_obj
+            if (match_all or isinstance(env_obj, object_type)) and get_distance(env_obj.location, agent_loc) <= sense_range:
+                dynamic_objs.append((self.__registration_order[obj_id], obj_id, env_obj))
+        dynamic_objs.sort(key=lambda item: item[0])
+
+        # return all objects in the order they were registered
+        env_objs = OrderedDict((obj_id, env_obj) for _, obj_id, env_obj in
+                               heapq.merge(static_objs, dynamic_objs, key=lambda item: item[0]))
 
         # agents are also environment objects, but stored separably. Also check them.
         for agent_id, agent_obj in self.__registered_agents.items():
@@ -399,22 +558,36 @@ class GridWorld:
 
         # Remove object first from grid
         grid_obj = self.get_env_object(object_id)  # get the object
-        loc = grid_obj.location  # its location
-
-        self.__grid[loc[1], loc[0]].remove(grid_obj.obj_id)  # remove the object id from the list at that location
-        if len(self.__grid[loc[1], loc[0]]) == 0:  # if the list is empty, just add None there
-            self.__grid[loc[1], loc[0]] = None
+        self.__remove_from_grid_cell(grid_obj)
+        self.__registration_order.pop(object_id, None)
+
+        # And from the world state
+        grid_obj._properties_listener = None
+        self.__env_obj_states.pop(object_id, None)
+        self.__updating_objects.pop(object_id, None)
+        self.__dynamic_objects.pop(object_id, None)
+        if self.__static_objects.pop(object_id, None) is not None:
+            self.__static_objs_in_range = {}
+        self.__world_state_version += 1
+        if self.__entity_table is not None:
+            self.__entity_table.remove(object_id)
+        self.__traversability_changed_ids.discard(object_id)
+        if object_id in self.__intraversable_ids:
+            self.__intraversable_ids.discard(object_id)
+            self.__opacity_version += 1
 
         # Remove object from the list of registered agents or environmental objects
         # Check if it is an agent
         if object_id in self.__registered_agents.keys():
             # Check if the agent was carrying something, if so remove property from carried item
             for obj_id in self.__registered_agents[object_id].is_carrying:
+                self.__environment_objects[obj_id]._properties_changed()
                 self.__environment_objects[obj_id].carried_by.remove(object_id)
 
             # Remove agent
             success = self.__registered_agents.pop(object_id,
                                                    default=False)  # if it exists, we get it otherwise False
+            self.__agent_brains.pop(object_id, None)
 
         # Else, check if it is an object
         elif object_id in self.__environment_objects.keys():
@@ -423,6 +596,7 @@ class GridWorld:
                 # If the object was carried, remove this from the agent properties as well
                 for agent_id in self.__environment_objects[object_id].carried_by:
                     obj = self.__environment_objects[object_id]
+                    self.__registered_agents[agent_id]._properties_changed()
                     self.__registered_agents[agent_id].is_carrying.remove(obj)
 
             # Remove object
@@ -482,12 +656,19 @@ class GridWorld:
 
         # Add agent to registered agents
         self.__registered_agents[agent_body.obj_id] = agent_body
+        self.__agent_brains[agent_body.obj_id] = agent
+        self.__registration_order[agent_body.obj_id] = next(self.__registration_counter)
+        self.__add_to_grid(agent_body)
+        agent_body._properties_listener = self.__agent_properties_changed
+        self.__add_opacity(agent_body)
+        if self.__entity_table is not None:
+            self.__entity_table.add(agent_body, is_agent=True, order=self.__registration_order[agent_body.obj_id])
 
         if self.__verbose:
             print(f"@{os.path.basename(__file__)}: Created agent with id {agent_body.obj_id}.")
 
-        # Get all properties from the agent avatar
-        avatar_props = agent_body.properties
+        # Get all properties from the agent avatar (a copy, as the agent is allowed to change them)
+        avatar_props = agent_body.properties.copy()
 
         if agent_body.is_human_agent is False:
             agent._factory_initialise(agent_name=agent_body.obj_name,
@@ -522,6 +703,26 @@ class GridWorld:
 
         # Assign id to environment sparse dictionary grid
         self.__environment_objects[env_object.obj_id] = env_object
+        self.__registration_order[env_object.obj_id] = next(self.__registration_counter)
+        self.__add_to_grid(env_object)
+
+        # Add the object to the world state, which is updated by the object itself whenever its properties change
+        env_object._properties_listener = self.__env_obj_properties_changed
+        self.__env_obj_states[env_object.obj_id] = env_object.properties
+        self.__world_state_version += 1
+        self.__add_opacity(env_object)
+        if self.__entity_table is not None:
+            self.__entity_table.add(env_object, is_agent=False, order=self.__registration_order[env_object.obj_id])
+
+        # Keep track of the objects that actually do something on an update, and of those that can not change location
+        # such that we only have to look once which of them are in range of a location
+        if type(env_object).update is not EnvObject.update:
+            self.__updating_objects[env_object.obj_id] = env_object
+        if env_object.is_movable or env_object.obj_id in self.__updating_objects:
+            self.__dynamic_objects[env_object.obj_id] = env_object
+        else:
+            self.__static_objects[env_object.obj_id] = env_object
+            self.__static_objs_in_range = {}
 
         if self.__verbose:
             print(f"@{__file__}: Created an environment object with id {env_object.obj_id}.")
@@ -582,10 +783,77 @@ class GridWorld:
                 self.__grid[loc[1], loc[0]].append(grid_obj.obj_id)
             else:
                 self.__grid[loc[1], loc[0]] = [grid_obj.obj_id]
+            self.__grid_locations[grid_obj.obj_id] = loc
+
+            # From now on the object tells us when it moves, so we can keep the grid up to date
+            grid_obj._location_listener = self.__move_in_grid
         else:
             raise BaseException(f"Object is not of type {str(type(EnvObject))} but of {str(type(grid_obj))} when adding"
                                 f" to grid in GridWorld.")
 
+    def __remove_from_grid_cell(self, grid_obj):
+        """ Removes the object's ID from the grid cell it is stored in, and stops tracking its location changes. """
+        grid_obj._location_listener = None
+        loc = self.__grid_locations.pop(grid_obj.obj_id, None)
+        if loc is None:
+            return
+
+        self.__grid[loc[1], loc[0]].remove(grid_obj.obj_id)  # remove the object id from the list at that location
+        if len(self.__grid[loc[1], loc[0]]) == 0:  # if the list is empty, just add None there
+            self.__grid[loc[1], loc[0]] = None
+
+    def __move_in_grid(self, grid_obj):
+        """ Called by an object on the grid whenever its location changes, moves its ID to the new grid cell. """
+        if grid_obj.location == self.__grid_locations.get(grid_obj.obj_id):
+            return
+        self.__remove_from_grid_cell(grid_obj)
+        self.__add_to_grid(grid_obj)
+
+        # A static object that moves anyway is no longer static
+        if self.__static_objects.pop(grid_obj.obj_id, None) is not None:
+            self.__dynamic_objects[grid_obj.obj_id] = grid_obj
+            self.__static_objs_in_range = {}
+
+        if self.__entity_table is not None:
+            self.__entity_table.move(grid_obj)
+
+        if grid_obj.obj_id in self.__intraversable_ids:
+            self.__opacity_version += 1
+
+    def __env_obj_properties_changed(self, env_object):
+        """ Called by a registered environment object whenever its properties changed, so only its properties are
+        updated in the next world state. """
+        self.__changed_obj_ids.add(env_object.obj_id)
+        self.__world_state_version += 1
+        self.__traversability_changed_ids.add(env_object.obj_id)
+        if self.__entity_table is not None:
+            self.__entity_table.mark_changed(env_object)
+
+    def __agent_properties_changed(self, agent_body):
+        """ Called by a registered agent whenever its properties changed. """
+        self.__traversability_changed_ids.add(agent_body.obj_id)
+        if self.__entity_table is not None:
+            self.__entity_table.mark_changed(agent_body)
+
+    def __add_opacity(self, grid_obj):
+        """ Keeps track of a newly registered object or agent if it is intraversable, see __get_opacity_version. """
+        if not grid_obj.is_traversable:
+            self.__intraversable_ids.add(grid_obj.obj_id)
+            self.__opacity_version += 1
+
+    def __get_opacity_version(self):
+        """ Returns the version of the locations of all intraversable objects and agents, which is increased whenever
+        one is added, removed or moved, or an object or agent becomes (in)traversable. """
+        for obj_id in self.__traversability_changed_ids:
+            grid_obj = self.__environment_objects.get(obj_id, self.__registered_agents.get(obj_id))
+            if grid_obj is None:
+                continue
+            if grid_obj.is_traversable == (obj_id in self.__intraversable_ids):
+                self.__intraversable_ids.symmetric_difference_update({obj_id})
+                self.__opacity_version += 1
+        self.__traversability_changed_ids = set()
+        return self.__opacity_version
+
     def __validate_obj_placement(self, env_object):
         """
         Checks whether an object can be successfully placed on the grid
@@ -612,41 +880,23 @@ class GridWorld:
                             f"occupied by intraversable object {intraversable_objs} at location {obj_loc}")
 
     def __step(self):
-
-        # Set tick start of current tick
-        start_time_current_tick = datetime.datetime.now()
-
-        # Get the world state
-        world_state = self.__get_complete_state()
-
-        # Check if we are done based on our global goal assessment function
-        self.__is_done, goal_status = self.__check_simulation_goal(world_state)
-
-        area_tiles = [(2, 2), (2, 3), (3, 2), (3, 3), (4, 2), (4, 3), (8, 2), (8, 3), (9, 2), (9, 3), (10, 2), (10, 3), (14, 2), (14, 3), (15, 2), (15, 3), (16, 2), (16, 3), (20, 2), (20, 3),
-                (21, 2), (21, 3), (22, 2), (22, 3), (2, 8), (2, 9), (3, 8), (3, 9), (4, 8), (4, 9), (8, 8), (8, 9), (9, 8), (9, 9), (10, 8), (10, 9), (14, 8), (14, 9), (15, 8), (15, 9),
-                (16, 8), (16, 9), (2, 14), (2, 15), (3, 14), (3, 15), (4, 14), (4, 15), (8, 14), (8, 15), (9, 14), (9, 15), (10, 14), (10, 15), (14, 14), (14, 15), (15, 14), (15, 15), (16, 14),
-                (16, 15), (2, 20), (2, 21), (3, 20), (3, 21), (4, 20), (4, 21), (8, 20), (8, 21), (9, 20), (9, 21), (10, 20), (10, 21), (14, 20), (14, 21), (15, 20), (15, 21), (16, 20), 
-                (16, 21), (20, 20), (20, 21), (21, 20), (21, 21), (22, 20), (22, 21), (23, 8), (23, 9), (23, 10), (23, 11), (23, 12), (23, 13), (23, 14), (23, 15),
-                (3, 4), (9, 4), (15, 4), (21, 4), (3, 7), (9, 7), (15, 7), (3, 16), (9, 16), (15, 16), (3, 19), (9, 19), (15, 19), (21, 19)]
-
-        # Log the data if we have any loggers
-        for logger in self.__loggers:
-            agent_data_dict = {}
-            for agent_id, agent_body in self.__registered_agents.items():
-                agent_data_dict[agent_id] = agent_body.get_log_data()
-
-            # Check if the logger is an old or V2 version.
-            if isinstance(logger, GridWorldLoggerV2):
-                logger._grid_world_log(world_state=world_state, agent_data=agent_data_dict, grid_world=self,
-                                       last_tick=self.__is_done, goal_status=goal_status)
-            else:
-                logger._grid_world_log(agent_data=agent_data_dict, grid_world=self,
-                                       last_tick=self.__is_done, goal_status=goal_status)
+        start_time_current_tick, tick_start, tick_timings, world_state = self.__start_tick()
 
         # If this grid_world is done, we return immediately
         if self.__is_done:
             return self.__is_done, 0.
 
+        # Whether to send the states of this tick to the api, which we skip when dropping frames to catch up
+        send_frame = self.__run_matrx_api and not (self.__behind_schedule and
+                                                   self.__tick_catch_up == self.DROP_FRAMES_CATCH_UP)
+
+        # When running headless, we warp through the ticks in which no agent decides or acts and no object updates
+        # itself, as those only check the goal and log.
+        if self.__headless:
+            active_tick = self.__next_active_tick()
+            if active_tick > self.__current_nr_ticks:
+                return self.__warp(active_tick, start_time_current_tick, tick_start, tick_timings)
+
         # initialize a temporary dictionary in which all states of this tick
         # will be saved. After all agents have been updated, the new tick info
         # will be made accessible via the api.
@@ -664,28 +914,41 @@ class GridWorld:
         # Then go to the next agent.
         # This blocks until a response from the agent is received (hence a tick can take longer than self.tick_
         # duration!!)
+        # When agents decide in worker processes, all agents that are not human agents start deciding (or, when busy,
+        # observing) here at once. Their decisions are then processed below, in the same order as when they decide one
+        # by one.
+        decisions = self.__start_agent_decisions(tick_timings, send_frame) if self.__agent_workers is not None else {}
+
         action_buffer = OrderedDict()
         for agent_id, agent_obj in self.__registered_agents.items():
+            agent_timings = tick_timings["agents"].setdefault(agent_id, {"state": 0., "decision": 0.})
+            phase_start = time.perf_counter()
 
-            state = self.__get_agent_state(agent_obj)
-            if 'human' in agent_id:
-               self.human_loc = agent_obj.location
+            if agent_id in decisions:
+                state = None  # the agent receives its state in its worker process
+            else:
+                state = self.__get_agent_state(agent_obj)
 
             # check if this agent is busy performing an action , if so then also check if it as its last tick of waiting
             # because then we want to do that action. If not busy, call its get_action function.
             if agent_obj._check_agent_busy(curr_tick=self.__current_nr_ticks):
 
                 # only do the filter observation method to be able to update the agent's state to the api
-                filtered_agent_state = agent_obj.filter_observations(state)
+                if agent_id in decisions:
+                    filtered_agent_state = self.__agent_workers.result(decisions[agent_id])
+                else:
+                    filtered_agent_state = agent_obj.filter_observations(state)
 
                 # save the current agent's state for the api
-                if self.__run_matrx_api:
+                if send_frame:
                     api._add_state(agent_id=agent_id, state=filtered_agent_state,
                                    agent_inheritence_chain=agent_obj.class_inheritance,
                                    world_settings=world_state['World'])
+            agent_timings["state"] += time.perf_counter() - phase_start
+
+            if self.__agent_decides(agent_id, agent_obj):
 
-            if not agent_obj._check_agent_busy(curr_tick=self.__current_nr_ticks) or 'human' in agent_id and self.__current_nr_ticks > 950 and self.__current_nr_ticks < 1050 and self.human_loc not in area_tiles or \
-                    'human' in agent_id and self.__current_nr_ticks > 1850 and self.__current_nr_ticks < 1950 and self.human_loc not in area_tiles or 'human' in agent_id and self.__current_nr_ticks > 2750 and self.__current_nr_ticks < 2850 and self.human_loc not in area_tiles:
+                phase_start = time.perf_counter()
 
                 # Any received data from the api for this HumanAgent is send along to the get_action function
                 if agent_obj.is_human_agent:
@@ -694,13 +957,20 @@ class GridWorld:
                         usrinp = api._pop_userinput(agent_id)
 
                     filtered_agent_state, agent_properties, action_class_name, action_kwargs = \
-                        agent_obj.get_action_func(state=state, agent_properties=agent_obj.properties, agent_id=agent_id,
+                        agent_obj.get_action_func(state=state, agent_properties=agent_obj.properties.copy(),
+                                                  agent_id=agent_id,
                                                   user_input=usrinp)
+                elif agent_id in decisions:  # not a HumanAgent, and deciding in a worker process
+
+                    # wait for the agent's get_action method (executed in the worker process) to finish, which also
+                    # returns the messages the agent wants to send
+                    filtered_agent_state, agent_properties, action_class_name, action_kwargs, agent_messages = \
+                        self.__agent_workers.result(decisions[agent_id])
                 else:  # not a HumanAgent
 
                     # perform the agent's get_action method (goes through filter_observations and decide_on_action)
                     filtered_agent_state, agent_properties, action_class_name, action_kwargs = agent_obj.get_action_func(
-                        state=state, agent_properties=agent_obj.properties, agent_id=agent_id)
+                        state=state, agent_properties=agent_obj.properties.copy(), agent_id=agent_id)
 
                 # the Agent (in the OODA loop) might have updated its properties, process these changes in the Avatar
                 # Agent
@@ -710,13 +980,16 @@ class GridWorld:
                 # agent to perform an action with a duration indefinitely (and since all actions have a duration, that
                 # would be killing...)
                 self.__set_agent_busy(action_name=action_class_name, action_kwargs=action_kwargs, agent_id=agent_id)
+                agent_timings["decision"] += time.perf_counter() - phase_start
+                phase_start = time.perf_counter()
 
                 # Get all agents we have, as we need these to process all messages that are send to all agents
                 all_agent_ids = self.__registered_agents.keys()
 
                 # Obtain all communication messages if the agent has something to say to others (only comes here when
                 # the agent is NOT busy)
-                agent_messages = agent_obj.get_messages_func(all_agent_ids)
+                if agent_id not in decisions:
+                    agent_messages = agent_obj.get_messages_func(all_agent_ids)
 
                 # add any messages received from the api sent by this agent
                 if self.__run_matrx_api:
@@ -729,12 +1002,15 @@ class GridWorld:
                 # preprocess all messages of the current tick of this agent
                 self.message_manager.preprocess_messages(self.__current_nr_ticks, agent_messages,
                                                          all_agent_ids, self.__teams)
+                tick_timings["messages"] += time.perf_counter() - phase_start
 
             # save the current agent's state for the api
-            if self.__run_matrx_api:
+            if send_frame:
+                phase_start = time.perf_counter()
                 api._add_state(agent_id=agent_id, state=filtered_agent_state,
                                agent_inheritence_chain=agent_obj.class_inheritance,
                                world_settings=world_state['World'])
+                tick_timings["api"] += time.perf_counter() - phase_start
 
             # if this agent is at its last tick of waiting on its action duration, we want to actually perform the
             # action
@@ -745,15 +1021,18 @@ class GridWorld:
                 action_buffer[agent_id] = (action_class_name, action_kwargs)
 
         # put all messages of the current tick in the message buffer
+        phase_start = time.perf_counter()
         if self.__current_nr_ticks in self.message_manager.preprocessed_messages:
             for mssg in self.message_manager.preprocessed_messages[self.__current_nr_ticks]:
                 if mssg.to_id not in self.__message_buffer.keys():  # first message for this receiver
                     self.__message_buffer[mssg.to_id] = [mssg]
                 else:
                     self.__message_buffer[mssg.to_id].append(mssg)
+        tick_timings["messages"] += time.perf_counter() - phase_start
 
         # save the god view state
-        if self.__run_matrx_api:
+        phase_start = time.perf_counter()
+        if send_frame:
             api._add_state(agent_id="god", state=world_state, agent_inheritence_chain="god",
                            world_settings=world_state['World'])
 
@@ -761,10 +1040,14 @@ class GridWorld:
             # agents have been updated
             api._current_tick = self.__current_nr_ticks
             api._next_tick()
+            api._MATRX_info["tick_drift"] = self.__tick_drift
+        if self.__run_matrx_api:
             self.__tick_duration = api.tick_duration
             api._grid_size = self.shape
+        tick_timings["api"] += time.perf_counter() - phase_start
 
         # Perform the actions in the order of the action_buffer (which is filled in order of registered agents
+        phase_start = time.perf_counter()
         for agent_id, action in action_buffer.items():
             # Get the action class name
             action_class_name = action[0]
@@ -774,13 +1057,13 @@ class GridWorld:
             if action_kwargs is None:  # If kwargs is none, make an empty dict out of it
                 action_kwargs = {}
 
-            # Actually perform the action (if possible), also sets the result in the agent's brain
+            # Actually perform the action (if possible), also sets the result in the agent's brain. The grid is kept
+            # up to date by the objects themselves whenever they move.
             self.__perform_action(agent_id, action_class_name, action_kwargs, world_state)
-
-            # Update the grid
-            self.__update_grid()
+        tick_timings["actions"] = time.perf_counter() - phase_start
 
         # Send all messages between agents
+        phase_start = time.perf_counter()
         for receiver_id, messages in self.__message_buffer.items():
             # check if the receiver exists
             if receiver_id in self.__registered_agents.keys():
@@ -788,34 +1071,235 @@ class GridWorld:
                 self.__registered_agents[receiver_id].set_messages_func(messages)
 
         self.__message_buffer = {}
+        tick_timings["messages"] += time.perf_counter() - phase_start
 
-        # Perform the update method of all objects
+        # Perform the update method of all objects, on a new world state only if the actions changed anything
+        phase_start = time.perf_counter()
         compl_state = self.__get_complete_state()
-        for env_obj in self.__environment_objects.values():
+        for env_obj in self.__updating_objects.values():
             env_obj.update(self, compl_state)
+        tick_timings["object_updates"] = time.perf_counter() - phase_start
 
-        # Increment the number of tick we performed
-        self.__current_nr_ticks += 1
+        return self.__end_tick(start_time_current_tick, tick_start, tick_timings)
+
+    def __start_tick(self):
+        """ Starts a tick by checking whether we are done with the world state at its start, and logging.
+
+        :return: The time (time.monotonic) and time (time.perf_counter) at which the tick started, the timings of the
+        phases of this tick so far and the world state. When we are done, the timings are already recorded.
+        """
+
+        # Set tick start of current tick
+        start_time_current_tick = time.monotonic()
+
+        # Unless we are strict, this tick is scheduled to end one tick duration after the previous tick was scheduled
+        # to end (and not when that tick actually ended), such that ticks that took too long are compensated
+        if self.__tick_deadline is None or self.__tick_catch_up == self.STRICT_CATCH_UP:
+            self.__tick_deadline = start_time_current_tick
+
+        # The time spent in each phase of this tick (in seconds), see get_tick_timings
+        tick_timings = {"tick": self.__current_nr_ticks, "world_state": 0., "goal_check": 0., "logging": 0.,
+                        "agents": {}, "messages": 0., "api": 0., "actions": 0., "object_updates": 0., "sleep": 0.,
+                        "total": 0.}
+        tick_start = time.perf_counter()
+
+        # Get the world state
+        world_state = self.__get_complete_state()
+        phase_start = time.perf_counter()
+        tick_timings["world_state"] = phase_start - tick_start
+
+        # Check if we are done based on our global goal assessment function
+        self.__is_done, goal_status = self.__check_simulation_goal(world_state)
+        tick_timings["goal_check"] = time.perf_counter() - phase_start
+
+        # Log the data if we have any loggers
+        phase_start = time.perf_counter()
+        for logger in self.__loggers:
+            agent_data_dict = {}
+            for agent_id, agent_body in self.__registered_agents.items():
+                agent_data_dict[agent_id] = agent_body.get_log_data()
+
+            # Check if the logger is an old or V2 version.
+            if isinstance(logger, GridWorldLoggerV2):
+                logger._grid_world_log(world_state=world_state, agent_data=agent_data_dict, grid_world=self,
+                                       last_tick=self.__is_done, goal_status=goal_status)
+            else:
+                logger._grid_world_log(agent_data=agent_data_dict, grid_world=self,
+                                       last_tick=self.__is_done, goal_status=goal_status)
+        tick_timings["logging"] = time.perf_counter() - phase_start
+
+        if self.__is_done:
+            tick_timings["total"] = time.perf_counter() - tick_start
+            self.__tick_timings.append(tick_timings)
+
+        return start_time_current_tick, tick_start, tick_timings, world_state
+
+    def __warp(self, active_tick, start_time_current_tick, tick_start, tick_timings):
+        """ Ends the current tick and goes through the following ticks up to the given one, in which no agent decides
+        on or performs an action and no object updates itself. These ticks only check the goal and log, so the world
+        and the log rows are the same as when going through them entirely.
 
-        # Check how much time the tick lasted already
-        tick_end_time = datetime.datetime.now()
-        tick_duration = tick_end_time - start_time_current_tick
-        self.sleep_duration = self.__tick_duration - tick_duration.total_seconds()
+        :param active_tick: The next tick in which something happens, see __next_active_tick.
+        :return: Whether this GridWorld is done, and the duration of the last tick.
+        """
+        is_done, tick_duration = self.__end_tick(start_time_current_tick, tick_start, tick_timings)
+        while self.__current_nr_ticks < active_tick:
+            start_time_current_tick, tick_start, tick_timings, _ = self.__start_tick()
+            if self.__is_done:
+                return self.__is_done, 0.
+            is_done, tick_duration = self.__end_tick(start_time_current_tick, tick_start, tick_timings)
+        return is_done, tick_duration
+
+    def __end_tick(self, start_time_current_tick, tick_start, tick_timings):
+        """ Ends the current tick by sleeping until it is scheduled to end, and keeping track of its duration.
+
+        :param start_time_current_tick: The time (time.monotonic) at which the tick started.
+        :param tick_start: The time (time.perf_counter) at which the tick started, for the tick timings.
+        :param tick_timings: The timings of the phases of this tick so far.
+        :return: Whether this GridWorld is done, and the duration of the tick.
+        """
 
-        # Sleep for the remaining time of self.__tick_duration
-        self.__sleep()
+        # Increment the number of tick we performed
+        self.__current_nr_ticks += 1
 
-        # Compute the total time of our tick (including potential sleep)
-        tick_end_time = datetime.datetime.now()
-        tick_duration = tick_end_time - start_time_current_tick
-        self.__curr_tick_duration = tick_duration.total_seconds()
+        # Check how much time is left until this tick is scheduled to end
+        self.__tick_deadline += self.__tick_duration
+        self.sleep_duration = self.__tick_deadline - time.monotonic()
+        self.__behind_schedule = self.sleep_duration <= 0
+
+        # Sleep for the remaining time of this tick, unless we run headless and go as fast as possible
+        phase_start = time.perf_counter()
+        if not self.__headless:
+            self.__sleep()
+        tick_timings["sleep"] = time.perf_counter() - phase_start
+        tick_timings["total"] = time.perf_counter() - tick_start
+        self.__tick_timings.append(tick_timings)
+
+        # Compute the total time of our tick (including potential sleep), and how much longer it took than scheduled
+        # since the previous tick ended (which includes anything done in between ticks)
+        tick_end = time.monotonic()
+        self.__curr_tick_duration = tick_end - start_time_current_tick
+        period_start = start_time_current_tick if self.__last_tick_end is None else self.__last_tick_end
+        self.__tick_drift += (tick_end - period_start) - self.__tick_duration
+        self.__last_tick_end = tick_end
 
         if self.__verbose:
-            print(f"@{os.path.basename(__file__)}: Tick {self.__current_nr_ticks} took {tick_duration.total_seconds()} "
+            print(f"@{os.path.basename(__file__)}: Tick {self.__current_nr_ticks} took {self.__curr_tick_duration} "
                   f"seconds.")
 
         return self.__is_done, self.__curr_tick_duration
 
+    def __agent_decides(self, agent_id, agent_obj):
+        """ Whether an agent decides on a new action this tick, which it does when it is not busy with its previous
+        action. The human agent also decides while busy during the storms, when it is not sheltering in an area.
+        """
+        if not agent_obj._check_agent_busy(curr_tick=self.__current_nr_ticks):
+            return True
+
+        tick = self.__current_nr_ticks
+        is_storm = any(start < tick < end for start, end in _STORMS)
+        return 'human' in agent_id and is_storm and agent_obj.location not in _AREA_TILES
+
+    def __next_active_tick(self):
+        """ Returns the first tick from the current one in which an agent decides on or performs an action, or an object
+        updates itself.
+
+        Busy agents still observe their state on the ticks in between, which only has no lasting effect for brains that
+        declare to be stateless (see AgentBrain.stateless). So unless all busy agents have such a brain, this is the
+        current tick.
+        """
+        tick = self.__current_nr_ticks
+        if self.__updating_objects or not self.__registered_agents:
+            return tick
+
+        active_tick = math.inf
+        for agent_id, agent_obj in self.__registered_agents.items():
+            is_stateless = getattr(self.__agent_brains[agent_id], "stateless", False)
+            if self.__agent_decides(agent_id, agent_obj) or not is_stateless:
+                return tick
+
+            # the agent performs its action at the last tick of its duration, and decides in the tick after
+            active_tick = min(active_tick, agent_obj.current_action_tick_started +
+                              agent_obj.current_action_duration_in_ticks)
+
+            # the human agent also decides when a storm starts, unless it shelters in an area
+            if 'human' in agent_id and agent_obj.location not in _AREA_TILES:
+                active_tick = min([active_tick] + [start + 1 for start, _ in _STORMS if start + 1 > tick])
+
+        return active_tick
+
+    def __start_agent_workers(self):
+        """ Starts the worker processes in which the agents that are not human agents decide on their actions, and sends
+        the brain of each of these agents to one of them. The methods of those brains that the agent bodies call are
+        replaced by methods that call them in the worker process.
+        """
+        brains = {agent_id: brain for agent_id, brain in self.__agent_brains.items()
+                  if not self.__registered_agents[agent_id].is_human_agent}
+        self.__agent_workers = _AgentWorkers(self.__agent_processes, brains, self)
+
+        for agent_id, brain in brains.items():
+            agent_body = self.__registered_agents[agent_id]
+            for attr, value in list(agent_body.__dict__.items()):
+                if getattr(value, "__self__", None) is brain:
+                    # methods that return nothing do not have to wait for the worker process
+                    wait = attr not in ("set_action_result_func", "set_messages_func")
+                    agent_body.__dict__[attr] = _WorkerBrainMethod(self.__agent_workers, agent_id, value.__name__, wait)
+
+    def __stop_agent_workers(self):
+        """ Stops the worker processes of the agents, after which our brains of those agents are updated with the
+        brains as they are in the worker processes and the agent bodies call their methods again. """
+        brain_attributes = self.__agent_workers.stop()
+        self.__agent_workers = None
+
+        for agent_id, attributes in brain_attributes.items():
+            brain = self.__agent_brains.get(agent_id)
+            if brain is None:
+                continue
+
+            # update the brain, while keeping the callbacks we did not send along
+            callbacks = {attr: value for attr, value in brain.__dict__.items()
+                         if getattr(value, "__self__", None) is self}
+            brain.__dict__.clear()
+            brain.__dict__.update(attributes)
+            brain.__dict__.update(callbacks)
+
+            agent_body = self.__registered_agents[agent_id]
+            for attr, value in list(agent_body.__dict__.items()):
+                if isinstance(value, _WorkerBrainMethod):
+                    agent_body.__dict__[attr] = getattr(brain, value.method_name)
+
+    def __start_agent_decisions(self, tick_timings, send_frame):
+        """ Starts the decision of every agent whose brain is in a worker process, or when the agent is busy its
+        observation of its state, in those worker processes.
+
+        Only what changed in the state of an agent since the previous tick is sent to its worker process. Callbacks to
+        this GridWorld are not available to the brains in the worker processes (such as AgentBrain.is_action_possible).
+
+        :param tick_timings: The timings of the current tick, to which the time spent on each agent's state is added.
+        :param send_frame: Whether the filtered states of the agents are needed for the API.
+        :return: A dictionary with, for each of these agent IDs, the ticket of the result of its decision or observation
+        """
+        decisions = {}
+        all_agent_ids = list(self.__registered_agents.keys())
+        for agent_id, agent_obj in self.__registered_agents.items():
+            if not self.__agent_workers.hosts(agent_id):
+                continue
+
+            phase_start = time.perf_counter()
+            state_dict, world_info = self.__get_agent_state_dict(agent_obj)
+            state_changes = self.__agent_workers.state_changes(agent_id, state_dict, world_info)
+            if agent_obj._check_agent_busy(curr_tick=self.__current_nr_ticks):
+                decisions[agent_id] = self.__agent_workers.submit(agent_id, _observe_in_worker,
+                                                                  (state_changes, send_frame))
+            else:
+                decisions[agent_id] = self.__agent_workers.submit(agent_id, _decide_in_worker,
+                                                                  (state_changes, agent_id, agent_obj.properties.copy(),
+                                                                   all_agent_ids, send_frame))
+            tick_timings["agents"][agent_id] = {"state": time.perf_counter() - phase_start, "decision": 0.}
+
+        self.__agent_workers.send()
+        return decisions
+
     def __check_simulation_goal(self, world_state):
 
         goal_status = {}
@@ -844,8 +1328,8 @@ class GridWorld:
 
     def __sleep(self):
         """
-        Sleeps the current python process for the amount of time that is left after self.curr_tick_duration up to
-        in self.__tick_duration
+        Sleeps the current python process for the amount of time that is left until the current tick is scheduled to
+        end (self.sleep_duration). When we are behind schedule we do not sleep at all.
         :return:
         """
         if self.sleep_duration > 0:
@@ -856,7 +1340,10 @@ class GridWorld:
                 f"Program is to heavy to run real time")
 
     def __update_grid(self):
+        """ Rebuilds the entire grid from scratch. Only needed at initialization, after that the grid is kept up to
+        date incrementally when objects are added, removed or moved. """
         self.__grid = np.array([[None for _ in range(self.__shape[0])] for _ in range(self.__shape[1])])
+        self.__grid_locations = {}
         for obj_id, obj in self.__environment_objects.items():
             self.__add_to_grid(obj)
         for agent_id, agent in self.__registered_agents.items():
@@ -865,16 +1352,31 @@ class GridWorld:
     # get all objects and agents on the grid
     def __get_complete_state(self):
         """
-        Compile all objects and agents on the grid in one state dictionary
+        Compile all objects and agents on the grid in one state dictionary. Only the objects whose properties changed
+        since the previous state are updated, and if nothing changed at all during this tick the previous state is
+        returned as is.
         :return: state with all objects and agents on the grid
         """
 
+        # update the objects that changed
+        for obj_id in self.__changed_obj_ids:
+            if obj_id in self.__env_obj_states:
+                self.__env_obj_states[obj_id] = self.__environment_objects[obj_id].properties
+        self.__changed_obj_ids = set()
+
+        # the agents keep track of their own changes (such as what they carry), so we simply get their properties
+        agent_states = {agent.obj_id: agent.properties for agent in self.__registered_agents.values()}
+
+        # reuse the previous state if it is of this tick and nothing changed since
+        if self.__world_state_info is not None:
+            version, nr_ticks, prev_agent_states, prev_state = self.__world_state_info
+            if version == self.__world_state_version and nr_ticks == self.__current_nr_ticks \
+                    and prev_agent_states.keys() == agent_states.keys() \
+                    and all(prev_agent_states[agent_id] is props for agent_id, props in agent_states.items()):
+                return prev_state
+
         # create a state dict with all objects and agents
-        state_dict = {}
-        for obj_id, obj in self.__environment_objects.items():
-            state_dict[obj.obj_id] = obj.properties
-        for agent_id, agent in self.__registered_agents.items():
-            state_dict[agent.obj_id] = agent.properties
+        state_dict = {**self.__env_obj_states, **agent_states}
 
         # Create State
         state = State(own_id=None)
@@ -896,9 +1398,16 @@ class GridWorld:
         # Add world info to State
         state._add_world_info(world_info)
 
+        self.__world_state_info = (self.__world_state_version, self.__current_nr_ticks, agent_states, state)
+
         return state
 
     def __get_agent_state(self, agent_obj: AgentBody):
+        state_dict, world_info = self.__get_agent_state_dict(agent_obj)
+        return _create_state(agent_obj.obj_id, state_dict, world_info)
+
+    def __get_agent_state_dict(self, agent_obj: AgentBody):
+        """ Returns the properties of all objects the agent perceives by their ID, and the world info of its state. """
         agent_loc = agent_obj.location
         sense_capabilities = agent_obj.sense_capability.get_capabilities()
 
@@ -930,12 +1439,12 @@ class GridWorld:
 
         state_dict = {}
         # Save all properties of the sensed objects in a state dictionary
-        for env_obj in objs_in_range:
-            state_dict[env_obj] = objs_in_range[env_obj].properties
-
-        # Create State object out of state dict
-        state = State(agent_obj.obj_id)
-        state.state_update(state_dict)
+        if self.__lazy_properties:
+            for env_obj in objs_in_range:
+                state_dict[env_obj] = objs_in_range[env_obj].lazy_properties()
+        else:
+            for env_obj in objs_in_range:
+                state_dict[env_obj] = objs_in_range[env_obj].properties
 
         # Append generic properties (e.g. number of ticks, fellow team members, etc.}
         team_members = [agent_id for agent_id, other_agent in self.__registered_agents.items()
@@ -947,16 +1456,14 @@ class GridWorld:
             "tick_duration": self.tick_duration,
             "team_members": team_members,
             "world_ID": self.world_id,
+            "opacity_version": self.__get_opacity_version(),
             "vis_settings": {
                 "vis_bg_clr": self.__visualization_bg_clr,
                 "vis_bg_img": self.__visualization_bg_img
             }
         }
 
-        # Add it to State
-        state._add_world_info(world_info)
-
-        return state
+        return state_dict, world_info
 
     def __check_action_is_possible(self, agent_id, action_name, action_kwargs, world_state):
         # If the action_name is None, the agent idles
@@ -979,10 +1486,8 @@ class GridWorld:
 
         # Check if action is known
         elif action_name in self.__all_actions.keys():
-            # Get action class
-            action_class = self.__all_actions[action_name]
-            # Make instance of action
-            action = action_class()
+            # Get the action
+            action = self.__get_action(action_name)
             # Check if action is possible, if so we can perform the action otherwise we send an ActionResult that it was
             # not possible.
             result = action.is_possible(self, agent_id, world_state=world_state, **action_kwargs)
@@ -1006,16 +1511,11 @@ class GridWorld:
             if action_name is None:
                 return result
 
-            # Get action class
-            action_class = self.__all_actions[action_name]
-            # Make instance of action
-            action = action_class()
+            # Get the action
+            action = self.__get_action(action_name)
             # Apply world mutation
             result = action.mutate(self, agent_id, world_state=world_state, **action_kwargs)
 
-            # Update the grid
-            self.__update_agent_location(agent_id)
-
         # Get agent's send_result function
         set_action_result = self.__registered_agents[agent_id].set_action_result_func
 
@@ -1025,6 +1525,52 @@ class GridWorld:
         # Whether the action succeeded or not, we return the result
         return result
 
+    def get_tick_timings(self, nr_ticks=None):
+        """ Returns how long each phase of the most recent ticks took.
+
+        Only the timings of the last `defaults.GRIDWORLD_NR_TICK_TIMINGS` ticks are kept.
+
+        Parameters
+        ----------
+        nr_ticks : int (optional, None)
+            The number of most recent ticks to return the timings of. When None, the timings of all kept ticks are
+            returned.
+
+        Returns
+        -------
+        list
+            A list with a dictionary for each tick, from the oldest to the most recent tick. Each dictionary contains
+            the tick number ("tick") and the seconds spent on compiling the world state ("world_state"), checking the
+            simulation goal ("goal_check"), logging ("logging"), processing messages ("messages"), the api ("api"),
+            performing actions ("actions"), updating objects ("object_updates"), sleeping ("sleep") and the entire
+            tick ("total"). In addition, "agents" contains for each agent ID the seconds spent on building the agent's
+            state ("state") and on its decision ("decision").
+
+        Examples
+        --------
+
+        Find out what took the most time in the slowest of the last 100 ticks:
+        >>> timings = grid_world.get_tick_timings(nr_ticks=100)
+        >>> slowest = max(timings, key=lambda t: t["total"])
+
+        """
+        timings = list(self.__tick_timings)
+        if nr_ticks is not None:
+            timings = timings[len(timings) - min(nr_ticks, len(timings)):]
+        return timings
+
+    def __get_action(self, action_name):
+        """ Returns the instance of the action with the given name, which includes its default duration.
+
+        Actions do not keep any state between checking or performing them, so each action is only instantiated the
+        first time it is used and that instance is reused for all agents and ticks after that.
+        """
+        action = self.__action_instances.get(action_name)
+        if action is None:
+            action = self.__all_actions[action_name]()
+            self.__action_instances[action_name] = action
+        return action
+
     def __set_agent_busy(self, action_name, action_kwargs, agent_id):
 
         # Check if the action_name is None, in which case we simply idle for one tick
@@ -1033,10 +1579,8 @@ class GridWorld:
 
         else:  # action is not None
 
-            # Get action class
-            action_class = self.__all_actions[action_name]
-            # Make instance of action
-            action = action_class()
+            # Get the action
+            action = self.__get_action(action_name)
 
             # Obtain the duration of the action, defaults to the one of the action class if not in action_kwargs, and
             # otherwise that of Action
@@ -1058,25 +1602,6 @@ class GridWorld:
         # to its properties so others know what agent did)
         self.__registered_agents[agent_id]._set_current_action(action_name=action_name, action_args=action_kwargs)
 
-    def __update_agent_location(self, agent_id):
-        # Get current location of the agent
-        loc = self.__registered_agents[agent_id].location
-        # Check if that spot in our list that represents the grid, is None or a list of other objects
-        if self.__grid[loc[1], loc[0]] is not None:  # If not None, we append the agent id to it
-            self.__grid[loc[1], loc[0]].append(agent_id)
-        else:  # if none, we make a new list with the agent id in it.
-            self.__grid[loc[1], loc[0]] = [agent_id]
-
-        # Update the Agent Avatar's location as well
-        self.__registered_agents[agent_id].location = loc
-
-    def __update_obj_location(self, obj_id):
-        loc = self.__environment_objects[obj_id].location
-        if self.__grid[loc[1], loc[0]] is not None:
-            self.__grid[loc[1], loc[0]].append(obj_id)
-        else:
-            self.__grid[loc[1], loc[0]] = [obj_id]
-
     def __warn(self, warn_str):
         return f"[@{self.__current_nr_ticks}] {warn_str}"
 
@@ -1128,3 +1653,239 @@ class GridWorld:
     @property
     def loggers(self):
         return self.__loggers
+
+    @property
+    def tick_drift(self):
+        """float: The number of seconds all ticks so far took in total longer than scheduled by the tick duration (not
+        counting the time the GridWorld was paused). Negative when ticks were shorter. """
+        return self.__tick_drift
+
+    @property
+    def headless(self):
+        """Bool: Whether this GridWorld runs headless: without the API and as fast as possible. """
+        return self.__headless
+
+    @property
+    def entity_table(self):
+        """EntityTable: The table of the location, traversability and type of all objects and agents, or None when this
+        GridWorld does not use one. """
+        return self.__entity_table
+
+
+def _create_state(agent_id, state_dict, world_info):
+    """ Creates the State of an agent from the properties of the objects it perceives and the world info. """
+    state = State(agent_id)
+    state.state_update(state_dict)
+    state._add_world_info(world_info)
+    return state
+
+
+class _AgentWorkers:
+    """ The worker processes in which the agents that are not human agents decide on their actions.
+
+    The brain of each agent is sent to one of the processes when they start, and stays there until they are stopped.
+    Calls to a brain are submitted with a function to call on it in its worker process, which are sent to that process
+    in one go (see send). Each worker process handles its calls in order, so the calls to each brain are made in the
+    order in which they were submitted.
+
+    Parameters
+    ----------
+    nr_processes : int
+        The number of worker processes.
+    brains : dict
+        The brains to send to the worker processes, by agent ID.
+    grid_world : GridWorld
+        The GridWorld of the agents, whose callbacks are not sent along with the brains.
+    """
+
+    def __init__(self, nr_processes, brains, grid_world):
+        self.__connections = []  # the connection with each worker process
+        self.__processes = []
+        self.__worker_of = {}  # the index of the worker process of each agent ID
+        self.__calls = []  # the calls submitted to each worker process that are not yet sent
+        self.__in_flight = []  # the tickets of the calls sent to each worker process whose results are not received
+        self.__results = {}  # the results received so far, by ticket
+        self.__ticket_workers = {}  # the worker process of each ticket whose result is not received
+        self.__tickets = itertools.count()
+        self.__sent_states = {}  # the state dictionary last sent for each agent ID
+
+        worker_brains = [{} for _ in range(min(nr_processes, max(len(brains), 1)))]
+        for i, (agent_id, brain) in enumerate(brains.items()):
+            # a copy of the brain without any of the GridWorld's callbacks, which can not be sent along
+            brain = copy.copy(brain)
+            for attr, value in list(brain.__dict__.items()):
+                if getattr(value, "__self__", None) is grid_world:
+                    del brain.__dict__[attr]
+            worker_brains[i % len(worker_brains)][agent_id] = brain
+            self.__worker_of[agent_id] = i % len(worker_brains)
+
+        for brains_of_worker in worker_brains:
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_agent_worker, args=(worker_connection,), daemon=True)
+            process.start()
+            worker_connection.close()
+            connection.send(brains_of_worker)
+            self.__connections.append(connection)
+            self.__processes.append(process)
+            self.__calls.append([])
+            self.__in_flight.append(None)
+
+    def hosts(self, agent_id):
+        """ Whether the brain of the agent is in one of the worker processes. """
+        return agent_id in self.__worker_of
+
+    def state_changes(self, agent_id, state_dict, world_info):
+        """ Returns the changes in the state of an agent since the state last sent to its worker process, to send along
+        with a call instead of the entire state. The properties of objects are compared by identity, as objects hand out
+        the same properties dictionary until they change. """
+        previous = self.__sent_states.get(agent_id, {})
+        changed = {obj_id: properties if type(properties) is dict else dict(properties)
+                   for obj_id, properties in state_dict.items() if previous.get(obj_id) is not properties}
+        order = None if list(previous) == list(state_dict) else list(state_dict)
+        self.__sent_states[agent_id] = state_dict
+        return _StateChanges(changed, order, world_info)
+
+    def submit(self, agent_id, function, args, wait=True):
+        """ Submits a call of function(brain, *args) to the brain of an agent in its worker process, which is made once
+        the calls are sent.
+
+        :return: The ticket with which the result of the call can be obtained, or None when we do not wait for it.
+        """
+        worker = self.__worker_of[agent_id]
+        ticket = next(self.__tickets) if wait else None
+        self.__calls[worker].append((ticket, agent_id, function, args))
+        if wait:
+            self.__ticket_workers[ticket] = worker
+        return ticket
+
+    def send(self):
+        """ Sends the submitted calls to the worker processes, which start with them at once. """
+        for worker, calls in enumerate(self.__calls):
+            if calls:
+                if self.__in_flight[worker] is not None:
+                    self.__receive(worker)
+                self.__connections[worker].send(calls)
+                self.__in_flight[worker] = calls
+                self.__calls[worker] = []
+
+    def result(self, ticket):
+        """ Returns the result of a call, waiting for its worker process to make it if needed. """
+        if ticket not in self.__results:
+            worker = self.__ticket_workers[ticket]
+            if self.__in_flight[worker] is None or all(call[0] != ticket for call in self.__in_flight[worker]):
+                self.send()
+            self.__receive(worker)
+        return self.__results.pop(ticket)
+
+    def stop(self):
+        """ Stops the worker processes, after sending any calls that were not sent yet.
+
+        :return: The attributes of each brain as it is in its worker process, by agent ID.
+        """
+        self.send()
+        brain_attributes = {}
+        for worker, connection in enumerate(self.__connections):
+            if self.__in_flight[worker] is not None:
+                self.__receive(worker)
+            connection.send(None)
+            brain_attributes.update(connection.recv())
+            connection.close()
+            self.__processes[worker].join()
+        return brain_attributes
+
+    def __receive(self, worker):
+        """ Receives the results of the calls in flight to a worker process. """
+        results, error = self.__connections[worker].recv()
+        for ticket, _, _, _ in self.__in_flight[worker]:
+            self.__ticket_workers.pop(ticket, None)
+        self.__in_flight[worker] = None
+        if error is not None:
+            raise RuntimeError(f"An agent raised an exception in its worker process:\n{error}")
+        self.__results.update(results)
+
+
+class _WorkerBrainMethod:
+    """ Stands in for a method of an agent's brain while that brain is in a worker process, by calling the method there.
+    When the method returns nothing, the call does not wait for the worker process but is sent along with the next calls
+    to it. """
+
+    def __init__(self, agent_workers, agent_id, method_name, wait):
+        self.agent_workers = agent_workers
+        self.agent_id = agent_id
+        self.method_name = method_name
+        self.wait = wait
+
+    def __call__(self, *args, **kwargs):
+        ticket = self.agent_workers.submit(self.agent_id, _call_in_worker, (self.method_name, args, kwargs), self.wait)
+        if self.wait:
+            return self.agent_workers.result(ticket)
+
+
+class _StateChanges:
+    """ The changes in the state of an agent since the previous state sent to its worker process: the properties of the
+    objects that changed, the order of all object IDs if that changed, and the world info. """
+
+    def __init__(self, changed, order, world_info):
+        self.changed = changed
+        self.order = order
+        self.world_info = world_info
+
+    def apply(self, state_dict):
+        """ Returns the state dictionary after these changes, changing the given previous one if possible. """
+        if self.order is None:
+            state_dict.update(self.changed)
+            return state_dict
+        return {obj_id: self.changed[obj_id] if obj_id in self.changed else state_dict[obj_id] for obj_id in self.order}
+
+
+def _agent_worker(connection):
+    """ The loop of a worker process of a GridWorld, which receives the brains it keeps and then lists of calls to them
+    (see _AgentWorkers), until it receives None. It then sends back the attributes of its brains. """
+    brains = connection.recv()
+    state_dicts = {agent_id: {} for agent_id in brains}  # the state dictionary of each agent, as last received
+
+    while True:
+        calls = connection.recv()
+        if calls is None:
+            connection.send({agent_id: brain.__dict__ for agent_id, brain in brains.items()})
+            return
+
+        results = {}
+        error = None
+        try:
+            for ticket, agent_id, function, args in calls:
+                if args and isinstance(args[0], _StateChanges):
+                    state_dicts[agent_id] = args[0].apply(state_dicts[agent_id])
+                    state = _create_state(agent_id, state_dicts[agent_id], args[0].world_info)
+                    args = (state,) + args[1:]
+                result = function(brains[agent_id], *args)
+                if ticket is not None:
+                    results[ticket] = result
+        except Exception:
+            error = traceback.format_exc()
+        connection.send((results, error))
+
+
+def _decide_in_worker(brain, state, agent_id, agent_properties, all_agent_ids, return_state):
+    """ Lets an agent brain decide on its action in a worker process, and collects the messages it wants to send.
+
+    :return: What its get_action method returned (without the filtered state unless asked for), and the messages.
+    """
+    filtered_state, agent_properties, action, action_kwargs = \
+        brain._get_action(state=state, agent_properties=agent_properties, agent_id=agent_id)
+    messages = brain._get_messages(all_agent_ids)
+    return filtered_state if return_state else None, agent_properties, action, action_kwargs, messages
+
+
+def _observe_in_worker(brain, state, return_state):
+    """ Lets a busy agent brain observe its state in a worker process.
+
+    :return: The filtered state if asked for, otherwise None.
+    """
+    filtered_state = brain._fetch_state(state)
+    return filtered_state if return_state else None
+
+
+def _call_in_worker(brain, method_name, args, kwargs):
+    """ Calls a method of an agent brain in a worker process. """
+    return getattr(brain, method_name)(*args, **kwargs)
@@ -258,6 +258,7 @@ class AgentBody(EnvObject):
 
         # We check if it is a custom property and if so change it simply in the dictionary
         if property_name in self.custom_properties.keys():
+            self._properties_changed()
             self.custom_properties[property_name] = property_value
         else:  # else we need to check if property_name is a mandatory class attribute that is also a property
             if property_name == "is_traversable":
@@ -337,6 +338,10 @@ class AgentBody(EnvObject):
         # Set the location to our private location xy list
         self.__location = loc
 
+        # Notify the GridWorld (if we are placed on its grid) that we moved
+        if self._location_listener is not None:
+            self._location_listener(self)
+
         # Carrying action is done here
         # First we check if we even have a 'carrying' property, as the future might hold an Agent's body who
         # specifically removes this property. In that case we return.
@@ -360,6 +365,43 @@ class AgentBody(EnvObject):
 
         In the case we return the properties of a class that inherits from EnvObject, we check if that class has
 
+        The returned dictionary is cached until one of the properties changes, so it is shared with anyone else who
+        requested them and should not be altered; use change_property instead.
+
+        Returns
+        -------
+        Properties : dict
+            All mandatory and custom properties in a dictionary.
+        """
+        # The objects we carry are altered in place (and have properties of their own), so check if those changed
+        cached = self._properties_cache
+        if cached is not None and (len(cached['is_carrying']) != len(self.is_carrying) or
+                                   any(props is not obj.properties
+                                       for props, obj in zip(cached['is_carrying'], self.is_carrying))):
+            self._properties_changed()
+
+        return super().properties
+
+    def lazy_properties(self):
+        """
+        See EnvObject.lazy_properties. The properties of an agent that carries objects are always built, as the objects
+        it carries may change without it knowing.
+        """
+        if self.is_carrying:
+            return self.properties
+        return super().lazy_properties()
+
+    @properties.setter
+    def properties(self, property_dictionary: dict):
+        """
+        Here to protect the 'properties' variable. It does not do anything and should not do anything!
+        """
+        pass
+
+    def _get_properties(self):
+        """
+        Builds a new dictionary with all the properties of this agent body, see the properties property.
+
         Returns
         -------
         Properties : dict
@@ -376,7 +418,7 @@ class AgentBody(EnvObject):
         properties['location'] = self.location
         properties['is_movable'] = self.is_movable
         properties['action_set'] = self.action_set
-        properties['carried_by'] = self.carried_by
+        properties['carried_by'] = list(self.carried_by)  # a copy, as it is altered in place
         properties['is_human_agent'] = self.is_human_agent
         properties['is_traversable'] = self.is_traversable
         properties['class_inheritance'] = self.class_inheritance
@@ -405,13 +447,6 @@ class AgentBody(EnvObject):
 
         return properties
 
-    @properties.setter
-    def properties(self, property_dictionary: dict):
-        """
-        Here to protect the 'properties' variable. It does not do anything and should not do anything!
-        """
-        pass
-
     @property
     def current_action(self):
         """The current action the agent is performing."""
@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class EntityTable:
+    """
+    A table with the location, traversability and type of all objects and agents in a GridWorld. These are stored as
+    NumPy arrays with a row for each object, such that spatial queries over all objects (e.g. which objects are within
+    range of a location, or which locations are traversable) are vectorized instead of going through the attributes
+    and properties of each object. The table also counts the intraversable objects and agents at each location, to
+    tell whether a location is occupied without going through the objects there.
+
+    The GridWorld keeps this table up to date; objects report any location change directly and any other property
+    change through their properties listener, after which their row is updated the next time the table is queried.
+
+    Parameters
+    ----------
+    capacity : int (optional, default 64)
+        The initial number of rows, which is doubled whenever the table is full.
+    """
+
+    def __init__(self, capacity=64):
+        self.__objects = [None] * capacity  # the object in each row
+        self.__x = np.zeros(capacity, dtype=np.int64)
+        self.__y = np.zeros(capacity, dtype=np.int64)
+        self.__is_traversable = np.zeros(capacity, dtype=bool)
+        self.__type_codes = np.zeros(capacity, dtype=np.int64)  # index in self.__types of each object's class
+        self.__is_agent = np.zeros(capacity, dtype=bool)
+        self.__order = np.zeros(capacity, dtype=np.int64)  # the order in which the objects were added to the world
+        self.__in_use = np.zeros(capacity, dtype=bool)  # whether a row holds an object
+
+        self.__rows = {}  # the row of each object ID
+        self.__free_rows = []  # rows of removed objects, reused for new objects
+        self.__nr_rows = 0  # the number of rows used so far, any rows after this were never used
+        self.__types = []  # the class of each type code
+        self.__type_code_of = {}  # the type code of each class
+        self.__changed_obj_ids = set()  # IDs of the objects whose row has to be updated before the next query
+        self.__intraversable = {}  # the number of intraversable [agents, objects] at each location with any
+
+    def add(self, obj, is_agent, order):
+        """ Adds an object or agent to the table.
+
+        Parameters
+        ----------
+        obj : EnvObject
+            The object or agent (AgentBody) to add.
+        is_agent : bool
+            Whether the object is a registered agent.
+        order : int
+            The order in which the object was added to the world, used to order query results.
+        """
+        if self.__free_rows:
+            row = self.__free_rows.pop()
+        else:
+            if self.__nr_rows == len(self.__objects):
+                self.__grow()
+            row = self.__nr_rows
+            self.__nr_rows += 1
+
+        obj_type = type(obj)
+        if obj_type not in self.__type_code_of:
+            self.__type_code_of[obj_type] = len(self.__types)
+            self.__types.append(obj_type)
+
+        self.__rows[obj.obj_id] = row
+        self.__objects[row] = obj
+        self.__type_codes[row] = self.__type_code_of[obj_type]
+        self.__is_agent[row] = is_agent
+        self.__order[row] = order
+        self.__in_use[row] = True
+        self.__x[row], self.__y[row] = obj.location
+        self.__is_traversable[row] = self.__get_is_traversable(obj)
+        self.__count_intraversable(row, 1)
+
+    def remove(self, obj_id):
+        """ Removes the object with the given ID from the table, if it is in it. """
+        row = self.__rows.pop(obj_id, None)
+        if row is None:
+            return
+        self.__count_intraversable(row, -1)
+        self.__objects[row] = None
+        self.__in_use[row] = False
+        self.__free_rows.append(row)
+        self.__changed_obj_ids.discard(obj_id)
+
+    def move(self, obj):
+        """ Updates the location of an object in the table to its current location. """
+        row = self.__rows[obj.obj_id]
+        self.__count_intraversable(row, -1)
+        self.__x[row], self.__y[row] = obj.location
+        self.__count_intraversable(row, 1)
+
+    def mark_changed(self, obj):
+        """ Marks that the properties of an object changed, so its row is updated before the next query. """
+        self.__changed_obj_ids.add(obj.obj_id)
+
+    def in_range(self, location, sense_range, object_type=None):
+        """ Returns the objects within range of a location.
+
+        Parameters
+        ----------
+        location : tuple
+            The (x, y) location from which to search.
+        sense_range : int
+            The (euclidean) distance from the location within which to find objects.
+        object_type : Class (optional, default None)
+            The class the objects should be an instance of. None or "*" for objects of any class.
+
+        Returns
+        -------
+        list
+            The objects in range, first all objects in the order they were added, followed by all agents.
+        """
+        n = self.__nr_rows
+        dx = self.__x[:n] - location[0]
+        dy = self.__y[:n] - location[1]
+        mask = self.__in_use[:n] & (np.sqrt(dx * dx + dy * dy) <= sense_range)
+        if object_type is not None and object_type != "*":
+            mask &= np.isin(self.__type_codes[:n], self.__type_codes_of(object_type))
+
+        rows = np.flatnonzero(mask)
+        rows = rows[np.lexsort((self.__order[rows], self.__is_agent[rows]))]
+        return [self.__objects[row] for row in rows]
+
+    def traversability_map(self, shape):
+        """ Returns which locations are traversable, which they are when there is no intraversable object or agent.
+
+        Parameters
+        ----------
+        shape : tuple
+            The (width, height) of the grid.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array of the given shape, indexed as [x, y], that is True where the location is traversable.
+        """
+        self.__update_changed()
+        n = self.__nr_rows
+        blocking = self.__in_use[:n] & ~self.__is_traversable[:n]
+        traversable = np.ones(shape, dtype=bool)
+        traversable[self.__x[:n][blocking], self.__y[:n][blocking]] = False
+        return traversable
+
+    def is_occupied(self, location):
+        """ Returns whether there is an intraversable object or agent at the given (x, y) location. """
+        self.__update_changed()
+        return tuple(location) in self.__intraversable
+
+    def intraversable_at(self, location):
+        """ Returns the number of intraversable agents and the number of intraversable objects at the given (x, y)
+        location. """
+        self.__update_changed()
+        nr_agents, nr_objects = self.__intraversable.get(tuple(location), (0, 0))
+        return nr_agents, nr_objects
+
+    def __update_changed(self):
+        """ Updates the rows of all objects whose properties changed since the last query. """
+        for obj_id in self.__changed_obj_ids:
+            row = self.__rows[obj_id]
+            is_traversable = self.__get_is_traversable(self.__objects[row])
+            if is_traversable != self.__is_traversable[row]:
+                self.__count_intraversable(row, -1)
+                self.__is_traversable[row] = is_traversable
+                self.__count_intraversable(row, 1)
+        self.__changed_obj_ids = set()
+
+    def __count_intraversable(self, row, delta):
+        """ Adds delta to the number of intraversable agents or objects at the location of the object in a row, if that
+        object is intraversable. """
+        if self.__is_traversable[row]:
+            return
+        loc = (int(self.__x[row]), int(self.__y[row]))
+        counts = self.__intraversable.setdefault(loc, [0, 0])
+        counts[0 if self.__is_agent[row] else 1] += delta
+        if counts == [0, 0]:
+            del self.__intraversable[loc]
+
+    @staticmethod
+    def __get_is_traversable(obj):
+        # Reading the (lazy) properties also makes sure the object reports its next change again (see
+        # EnvObject._properties_changed)
+        return bool(obj.lazy_properties()['is_traversable'])
+
+    def __type_codes_of(self, object_type):
+        """ Returns the type codes of all classes that are (a subclass of) the given class. """
+        return [code for code, obj_type in enumerate(self.__types) if issubclass(obj_type, object_type)]
+
+    def __grow(self):
+        """ Doubles the number of rows of the table. """
+        capacity = len(self.__objects)
+        self.__objects.extend([None] * capacity)
+        self.__x = np.concatenate([self.__x, np.zeros(capacity, dtype=self.__x.dtype)])
+        self.__y = np.concatenate([self.__y, np.zeros(capacity, dtype=self.__y.dtype)])
+        self.__is_traversable = np.concatenate([self.__is_traversable, np.zeros(capacity, dtype=bool)])
+        self.__type_codes = np.concatenate([self.__type_codes, np.zeros(capacity, dtype=self.__type_codes.dtype)])
+        self.__is_agent = np.concatenate([self.__is_agent, np.zeros(capacity, dtype=bool)])
+        self.__order = np.concatenate([self.__order, np.zeros(capacity, dtype=self.__order.dtype)])
+        self.__in_use = np.concatenate([self.__in_use, np.zeros(capacity, dtype=bool)])
@@ -1,6 +1,7 @@
 import matrx.defaults as defaults
 import warnings
 import re
+from collections.abc import Mapping
 
 class EnvObject:
     """
@@ -86,6 +87,11 @@ class EnvObject:
                  visualize_size=None, visualize_shape=None, visualize_colour=None, visualize_depth=None,
                  visualize_opacity=None, visualize_from_center=None, **custom_properties):
 
+        # The properties dictionary is only rebuilt when one of our attributes changed since it was last requested
+        self._properties_cache = None
+        # The LazyProperties handed out since our properties last changed, if any (see lazy_properties)
+        self._lazy_properties = None
+
         # Set the object's name.
         self.obj_name = name
 
@@ -161,10 +167,45 @@ class EnvObject:
         for k, v in custom_properties.items():
             self.custom_properties[k] = v
 
+        # Callback set by the GridWorld while this object is placed on its grid, so that any location change also
+        # moves the object's ID in the grid (instead of the GridWorld rebuilding its entire grid).
+        self._location_listener = None
+
+        # Callback set by the GridWorld while this object is registered, so that it only has to update the world state
+        # of the objects whose properties changed.
+        self._properties_listener = None
+
         # location should be set at the end (due to the dependency of its setter on the other properties (e.g. in
         # AgentAvatar)
         self.location = location
 
+    def __setattr__(self, key, value):
+        """
+        Any attribute may end up in our properties, so setting one to a new value drops the cached properties.
+        """
+        if (self.__dict__.get('_properties_cache') is not None or self.__dict__.get('_lazy_properties') is not None) \
+                and self.__dict__.get(key, _NOT_SET) is not value:
+            self._properties_changed()
+        super().__setattr__(key, value)
+
+    def _properties_changed(self):
+        """
+        Drops the cached properties, such that they are rebuilt the next time they are requested, and notifies the
+        GridWorld (if we are registered to it) that our properties changed.
+
+        Should be called by anything that changes the properties of this object in place (e.g. by altering the
+        custom_properties dictionary directly), as those changes can not be detected. As such it is called before the
+        change is made, so any LazyProperties we handed out can still build our properties as they were.
+        """
+        lazy_properties = self.__dict__.get('_lazy_properties')
+        if lazy_properties is not None:
+            self.__dict__['_lazy_properties'] = None
+            lazy_properties._materialize()
+        self.__dict__['_properties_cache'] = None
+        listener = self.__dict__.get('_properties_listener')
+        if listener is not None:
+            listener(self)
+
     def update(self, grid_world, state):
         """
         Used to update some properties of this object if needed. For example a 'status' property that changes over time.
@@ -201,6 +242,7 @@ class EnvObject:
 
         # We check if it is a custom property and if so change it simply in the dictionary
         if property_name in self.customizable_properties:
+            self._properties_changed()
             self.custom_properties[property_name] = property_value
         else:  # else we need to check if property_name is a mandatory class attribute that is also a property
             if property_name == "is_traversable":
@@ -253,6 +295,7 @@ class EnvObject:
             raise Exception("Attribute already exists, alter value with change_property instead")
         else:
             # We always add it as a custom property which is also customizable (since we can add it)
+            self._properties_changed()
             self.custom_properties[property_name] = property_value
             self.customizable_properties.append(property_name)
 
@@ -284,6 +327,10 @@ class EnvObject:
         assert len(loc) == 2
         self.__location = loc
 
+        # Notify the GridWorld (if we are placed on its grid) that we moved
+        if self._location_listener is not None:
+            self._location_listener(self)
+
     @property
     def properties(self):
         """
@@ -292,6 +339,44 @@ class EnvObject:
 
         In the case we return the properties of a class that inherits from EnvObject, we check if that class has
 
+        The returned dictionary is cached until one of the properties changes, so it is shared with anyone else who
+        requested them and should not be altered; use change_property instead.
+
+        Returns
+        -------
+        All mandatory and custom properties in a dictionary.
+        """
+        if self._properties_cache is None:
+            self.__dict__['_properties_cache'] = self._get_properties()
+        return self._properties_cache
+
+    @properties.setter
+    def properties(self, property_dictionary: dict):
+        """
+        Here to protect the 'properties' variable. It does not do anything and should not do anything!
+        """
+        pass
+
+    def lazy_properties(self):
+        """
+        Returns the same properties as the properties property, but when these have to be rebuilt a LazyProperties is
+        returned instead. That only builds them once a property is requested that is not one of the mandatory
+        properties most often queried, such as the location, name or traversability.
+
+        Returns
+        -------
+        The (cached) properties dictionary, or a read-only LazyProperties mapping.
+        """
+        if self._properties_cache is not None:
+            return self._properties_cache
+        if self._lazy_properties is None:
+            self.__dict__['_lazy_properties'] = LazyProperties(self)
+        return self._lazy_properties
+
+    def _get_properties(self):
+        """
+        Builds a new dictionary with all the properties of this object, see the properties property.
+
         Returns
         -------
         All mandatory and custom properties in a dictionary.
@@ -305,7 +390,7 @@ class EnvObject:
         properties['obj_id'] = self.obj_id  # we return id as well, but this should never ever be modified!
         properties['location'] = self.location
         properties['is_movable'] = self.is_movable
-        properties['carried_by'] = self.carried_by
+        properties['carried_by'] = list(self.carried_by)  # a copy, as it is altered in place
         properties['is_traversable'] = self.is_traversable
         properties['class_inheritance'] = self.class_inheritance
         properties['visualization'] = {
@@ -319,12 +404,68 @@ class EnvObject:
 
         return properties
 
-    @properties.setter
-    def properties(self, property_dictionary: dict):
-        """
-        Here to protect the 'properties' variable. It does not do anything and should not do anything!
-        """
-        pass
+
+class LazyProperties(Mapping):
+    """
+    A read-only stand-in for the properties of an EnvObject. It holds only the mandatory properties most often queried
+    and builds the full properties dictionary on the first request for any other property. The object makes sure this
+    happens before any of its properties change, so a LazyProperties always holds the properties the object had when
+    it was created.
+
+    Use dict(lazy_properties) to obtain a regular dictionary, for example to serialize it.
+
+    Parameters
+    ----------
+    obj : EnvObject
+        The object whose properties these are.
+    """
+
+    __slots__ = ('__obj', '__common', '__properties')
+
+    def __init__(self, obj):
+        self.__obj = obj
+        self.__common = {'name': obj.obj_name,
+                         'obj_id': obj.obj_id,
+                         'location': obj.location,
+                         'is_movable': obj.is_movable,
+                         'carried_by': obj.carried_by,
+                         'is_traversable': obj.is_traversable,
+                         'class_inheritance': obj.class_inheritance}
+        self.__properties = None
+
+    def __getitem__(self, key):
+        if self.__properties is None and key in self.__common:
+            return self.__common[key]
+        return self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __repr__(self):
+        return repr(self._materialize())
+
+    def __reduce__(self):
+        # Pickled (e.g. to send it to an agent process) as a regular dictionary
+        return dict, (self._materialize(),)
+
+    def copy(self):
+        """ Returns a (shallow) copy of the properties as a regular dictionary. """
+        return self._materialize().copy()
+
+    def _materialize(self):
+        """ Builds the full properties dictionary if not done yet and returns it. """
+        if self.__properties is None:
+            self.__properties = self.__obj.properties
+            self.__obj = None
+        return self.__properties
+
+
+# Marks an attribute that was not set before in EnvObject.__setattr__, as None can be a valid attribute value
+_NOT_SET = object()
+
 
 def _get_inheritence_path(callable_class):
     """ Returns the parent's class names of the given class.
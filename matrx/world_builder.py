@@ -34,7 +34,9 @@ class WorldBuilder:
     def __init__(self, shape, tick_duration=0.5, random_seed=1,
                  simulation_goal=1000, run_matrx_api=True,
                  run_matrx_visualizer=False, visualization_bg_clr="#C2C2C2",
-                 visualization_bg_img=None, verbose=False):
+                 visualization_bg_img=None, verbose=False, headless=False,
+                 agent_processes=None, tick_catch_up=GridWorld.SKIP_SLEEP_CATCH_UP,
+                 entity_table=False, lazy_properties=False):
 
         """
         With the constructor you can set a number of general properties and
@@ -80,6 +82,44 @@ class WorldBuilder:
         verbose : bool (optional, False)
             Whether the subsequent created world should be verbose or not.
 
+        headless : bool (optional, False)
+            Whether to run the created worlds headless: without the API and
+            visualizer, and without sleeping to hold the tick duration. The
+            worlds then tick as fast as possible, and warp through the ticks
+            in which all agents are busy and have a stateless brain (see
+            AgentBrain.stateless). Requires run_matrx_api and
+            run_matrx_visualizer to be False.
+
+        agent_processes : int (optional, None)
+            The number of worker processes in which the artificial (non-human)
+            agents decide on their actions in parallel. The brain of each agent
+            stays in one of these processes while the world runs, and only
+            receives what changed in its state each tick. Agents that decide in
+            parallel all observe the world as it was at the start of the tick.
+            This is only faster when each worker process has a CPU core of its
+            own, otherwise it is slightly slower. When None, all agents decide
+            one after another in the world's own process.
+
+        tick_catch_up : str (optional, GridWorld.SKIP_SLEEP_CATCH_UP)
+            How the created worlds catch up with their tick schedule after
+            ticks that took longer than the tick duration; by not sleeping
+            until back on schedule (GridWorld.SKIP_SLEEP_CATCH_UP), by also not
+            sending those ticks to the api (GridWorld.DROP_FRAMES_CATCH_UP) or
+            not at all (GridWorld.STRICT_CATCH_UP).
+
+        entity_table : bool (optional, False)
+            Whether the created worlds keep the location, traversability and
+            type of all objects and agents in NumPy arrays, such that finding
+            the objects within range of a location is vectorized and the move
+            actions look up whether a location is occupied without going
+            through the objects there. Worthwhile for worlds with many objects.
+
+        lazy_properties : bool (optional, False)
+            Whether the states of agents hold lazily built properties for the
+            objects whose properties changed, which are only built in full once
+            a property other than the most common ones (e.g. the location) is
+            requested.
+
         Raises
         ------
         ValueError
@@ -101,6 +141,17 @@ class WorldBuilder:
             >>> from matrx.world_builder import WorldBuilder
             >>> builder = WorldBuilder(shape=(10, 10), random_seed=42, tick_duration=-1, visualization_bg_clr="#000000")
 
+        To create a WorldBuilder for headless runs, e.g. for evaluations;
+
+            >>> from matrx.world_builder import WorldBuilder
+            >>> builder = WorldBuilder(shape=(10, 10), run_matrx_api=False, headless=True)
+
+        To create a WorldBuilder whose agents decide in parallel in four
+        worker processes;
+
+            >>> from matrx.world_builder import WorldBuilder
+            >>> builder = WorldBuilder(shape=(10, 10), agent_processes=4)
+
         """
 
         # Check if shape is of correct type and length
@@ -167,6 +218,36 @@ class WorldBuilder:
                              f"visualizer requires the api to work, so this "
                              f"is not possible.")
 
+        if not isinstance(headless, bool):
+            raise ValueError(f"The given value {headless} for headless is "
+                             f"invalid, should be of type bool.")
+
+        if headless and run_matrx_api:
+            raise ValueError(f"Headless is set to True while run_matrx_api is "
+                             f"set to True. A headless world runs without the "
+                             f"api, so this is not possible.")
+
+        if agent_processes is not None and (not isinstance(agent_processes, int) or agent_processes < 1):
+            raise ValueError(f"The given value {agent_processes} for agent_"
+                             f"processes is invalid, should be None or an int "
+                             f"bigger or equal to 1.")
+
+        catch_up_policies = [GridWorld.SKIP_SLEEP_CATCH_UP,
+                             GridWorld.DROP_FRAMES_CATCH_UP,
+                             GridWorld.STRICT_CATCH_UP]
+        if tick_catch_up not in catch_up_policies:
+            raise ValueError(f"The given value {tick_catch_up} for tick_catch_"
+                             f"up is invalid, should be one of "
+                             f"{catch_up_policies}.")
+
+        if not isinstance(entity_table, bool):
+            raise ValueError(f"The given value {entity_table} for entity_table "
+                             f"is invalid, should be a bool.")
+
+        if not isinstance(lazy_properties, bool):
+            raise ValueError(f"The given value {lazy_properties} for "
+                             f"lazy_properties is invalid, should be a bool.")
+
         # Set our random number generator
         self.rng = np.random.RandomState(random_seed)
         # Set our settings place holders
@@ -201,7 +282,12 @@ class WorldBuilder:
                                       visualization_bg_clr=visualization_bg_clr,
                                       visualization_bg_img=visualization_bg_img,
                                       verbose=self.verbose,
-                                      rnd_seed=random_seed)
+                                      rnd_seed=random_seed,
+                                      headless=headless,
+                                      agent_processes=agent_processes,
+                                      tick_catch_up=tick_catch_up,
+                                      entity_table=entity_table,
+                                      lazy_properties=lazy_properties)
         # Keep track of the number of worlds we created
         self.worlds_created = 0
 
@@ -2115,7 +2201,8 @@ class WorldBuilder:
                           **{**area_custom_properties, "room_name": name})
 
     def __set_world_settings(self, shape, tick_duration, simulation_goal, rnd_seed,
-                             visualization_bg_clr, visualization_bg_img, verbose):
+                             visualization_bg_clr, visualization_bg_img, verbose, headless, agent_processes,
+                             tick_catch_up, entity_table, lazy_properties):
 
         if rnd_seed is None:
             rnd_seed = self.rng.randint(0, 1000000)
@@ -2134,7 +2221,12 @@ class WorldBuilder:
                           "rnd_seed": rnd_seed,
                           "visualization_bg_clr": visualization_bg_clr,
                           "visualization_bg_img": visualization_bg_img,
-                          "verbose": verbose}
+                          "verbose": verbose,
+                          "headless": headless,
+                          "agent_processes": agent_processes,
+                          "tick_catch_up": tick_catch_up,
+                          "entity_table": entity_table,
+                          "lazy_properties": lazy_properties}
 
         return world_settings
 
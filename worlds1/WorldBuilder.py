@@ -98,19 +98,19 @@ def add_agents(builder, task_type, condition):
                 loc = (16,9)
             builder.add_human_agent(loc, brain, team=team_name, name='human', key_action_map=key_action_map, sense_capability=sense_capability_human, is_traversable=True, img_name="/images/rescue-man-final3.svg", visualize_when_busy=True)
 
-# Create the world
-def create_builder(task_type, condition):
+# Create the world. Set headless to True to run without the API and visualizer, as fast as possible (e.g. for evaluations)
+def create_builder(task_type, condition, headless=False):
     # Set numpy's random generator
     np.random.seed(random_seed)
     # Create the world builder
     if task_type=="official":
         # Create the collection goal
         goal = CollectionGoal(max_nr_ticks=5000)
-        builder = WorldBuilder(shape=[25,24], tick_duration=tick_duration, run_matrx_api=True, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
+        builder = WorldBuilder(shape=[25,24], tick_duration=tick_duration, run_matrx_api=not headless, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083', headless=headless)
     else:
         # Create the collection goal
         goal = CollectionGoal(max_nr_ticks=np.inf)
-        builder = WorldBuilder(shape=[19,19], tick_duration=tick_duration, run_matrx_api=True,random_seed=random_seed, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
+        builder = WorldBuilder(shape=[19,19], tick_duration=tick_duration, run_matrx_api=not headless,random_seed=random_seed, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083', headless=headless)
 
     # Add all areas and objects to the tutorial world
     if task_type == "tutorial":